@@ -0,0 +1,760 @@
+import glob
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+import scipy.fftpack as fft
+
+import engine
+import metrics
+import new_utils
+import scoring
+from new_algorithms import evaluate_t_values, best_t_value, t_value_errors, errors_psnrs, get_t_values, embedded_images, extracted_images, verify_blocks
+from parallel import JobPool
+from cache import DctCache
+from workspace import Workspace
+from pipeline import watermark_pipeline
+
+
+# folder of the images used to benchmark (every png inside test_images)
+images_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'test_images')
+
+
+# old dct using two scipy.fftpack passes, kept to compare against
+def fftpack_dct(img, ax=2):
+    return fft.dct( fft.dct( img, type=2, norm='ortho', axis=ax ), axis=ax+1, norm='ortho', type=2 )
+
+
+# old inverse dct using two scipy.fftpack passes
+def fftpack_idct(dct_values, ax=2):
+    return fft.idct( fft.idct( dct_values, type=2, norm='ortho', axis=ax ), axis=ax+1, norm='ortho', type=2 )
+
+
+# old blocking using hsplit/split, kept to compare against
+def split_extract_patches(img, patch_size):
+    h, w = img.shape[:2]
+    nh, nw = -(-h // patch_size) * patch_size, -(-w // patch_size) * patch_size
+    img = cv2.copyMakeBorder(img, 0, nh-h, 0, nw-w, cv2.BORDER_REPLICATE)
+    patches = np.array(np.hsplit(img, nw / patch_size))
+    patches = np.array(np.split(patches, nh / patch_size, axis=1))
+    return patches
+
+
+# old unblocking using two concatenations
+def concatenate_fusion_patches(patches):
+    patches = np.concatenate(patches, axis=1)
+    patches = np.concatenate(patches, axis=1)
+    return patches
+
+
+# old forward process: float copy, padding, split blocks, fftpack dct
+def split_forward_process(image, patch_size=8):
+    return fftpack_dct(split_extract_patches(np.float64(image), patch_size))
+
+
+# old backward process: fftpack idct, concatenate blocks, round and clip
+def concatenate_backward_process(image):
+    image = np.round(concatenate_fusion_patches(fftpack_idct(image)))
+    return np.clip(image, 0, 255).astype('uint8')
+
+
+# get the peak of memory allocated while running a function (numpy reports to tracemalloc)
+def peak_memory(function, *args, **kwargs):
+    tracemalloc.start()
+    function(*args, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+# get the best time of a function over some runs
+def timeit(function, *args, runs=5, **kwargs):
+    best = float('inf')
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+# old embedding of one masked channel: fftpack dct, T times the watermark added to coefficient b, fftpack inverse dct
+def fftpack_embed(channel, mark, t, b):
+    image_dct = split_forward_process(channel)
+    image_dct[:, :, b // 8, b % 8] += t * mark
+    return concatenate_backward_process(image_dct)[:channel.shape[0], :channel.shape[1]]
+
+
+# old extraction of one watermarked channel: bits read from the sign of coefficient b of the fftpack dct (from its noise
+# when the coefficient is 0), T times the bits removed from the coefficient and fftpack inverse dct
+def fftpack_extract(channel, t, b):
+    image_dct = split_forward_process(channel)
+    bits = np.where(image_dct[:, :, b // 8, b % 8] < 0, -1, 1)
+    image_dct[:, :, b // 8, b % 8] -= t * bits
+    return concatenate_backward_process(image_dct)[:channel.shape[0], :channel.shape[1]], bits
+
+
+# old embedding of every T value: coefficient b of a copy of the dct is modified and the inverse dct of every image
+# is calculated, kept to compare against the images built from the pixels by embedded_images
+def dct_embed(img, img_dct, normalized_mark, t, b):
+    h, w, d, _ = img_dct.shape
+    img_dct = img_dct.reshape(h*w, d*d)
+    img_h, img_w = img.shape[:2]
+    T = get_t_values(t)
+
+    # one copy of the image dct is modified for every T value
+    restored = np.empty((T.shape[0], img_h * img_w), dtype=np.uint8)
+    candidate_dct = np.empty_like(img_dct)
+    for i in range(T.shape[0]):
+        candidate_dct[:] = img_dct
+        candidate_dct[:, b] += normalized_mark.flatten() * T[i]
+        restored[i] = new_utils.backwardProcess(candidate_dct, shape=(h, w))[:img_h, :img_w].reshape(-1)
+
+    return restored
+
+
+# watermarked images of every T value built by embedded_images, one flattened image per row
+def pixel_embed(img, img_dct, normalized_mark, t, b):
+    T = get_t_values(t)
+    restored = np.empty((T.shape[0], img.shape[0] * img.shape[1]), dtype=np.uint8)
+    for i, (_, image) in enumerate(embedded_images(img, img_dct, normalized_mark, 8, t, b)):
+        restored[i] = image.reshape(-1)
+
+    return restored
+
+
+# old extraction of the candidates (image i embedded with the i-th T value of get_t_values(t)): the full dct of
+# every image, T removed from coefficient b with the sign read there and the inverse dct of every image
+def dct_extract(embedded_img, t, b, key=3994):
+    c, h, w = embedded_img.shape
+    img_h, img_w = h, w
+    embedded_img = embedded_img.reshape(c, h*w)
+    embedded_img_dct = np.apply_along_axis(new_utils.forwardProcess, 1, embedded_img, shape=(h, w))
+    mark_h, mark_w = embedded_img_dct.shape[1:3]
+    c, h, w, d, _ = embedded_img_dct.shape
+    embedded_img_dct = embedded_img_dct.reshape(c, h*w, d*d)
+
+    blocks = np.array([new_utils.extract_patches(image.reshape(img_h, img_w), 8) for image in embedded_img]).reshape(c, h*w, d, d)
+    extracted_mark = np.float32(new_utils.coefficient_signs(embedded_img_dct[:, :, b], blocks, b))
+    T = get_t_values(t)
+    T = np.float32(np.repeat(T, len(extracted_mark[0])).reshape(T.shape[0], len(extracted_mark[0])))
+    extracted_mark *= T
+    embedded_img_dct[:, :, b] -= extracted_mark
+
+    extracted_mark /= T
+    extracted_mark[extracted_mark == -1] = 0
+    extracted_mark = new_utils.image_scramble(extracted_mark.astype('uint8').reshape(T.shape[0], mark_h, mark_w), key) * 255
+
+    embedded_img_dct = embedded_img_dct.reshape(c, h*w*d*d)
+    extracted_original = np.apply_along_axis(new_utils.backwardProcess, 1, embedded_img_dct, shape=(h, w))[:, :img_h, :img_w]
+
+    return extracted_original.reshape(c, img_h*img_w), extracted_mark.astype('uint8')
+
+
+# extraction of the candidates by extracted_images, only coefficient b of every block is calculated
+def sparse_extract(embedded_img, t, b, key=3994):
+    c, img_h, img_w = embedded_img.shape
+    extracted_original = np.empty((c, img_h*img_w), dtype=np.uint8)
+    extracted_mark = []
+    for i, (_, _, original, mark) in enumerate(extracted_images(zip(get_t_values(t), embedded_img), 8, b, key)):
+        extracted_original[i] = original.reshape(-1)
+        extracted_mark.append(mark)
+
+    return extracted_original, np.array(extracted_mark)
+
+
+# load every channel of every test image
+def load_channels(folder=images_folder):
+    channels = []
+    for path in sorted(glob.glob(os.path.join(folder, '**', '*.png'), recursive=True)):
+        image = cv2.imread(path)
+        for i, channel in enumerate(cv2.split(image)):
+            channels.append((os.path.basename(path) + ':' + 'bgr'[i], channel))
+    return channels
+
+
+# compare the matrix basis dct with the fftpack one
+def benchmark_dct(channels):
+    print('block dct (forward + inverse), best of 5 runs')
+    print('%-28s %12s %12s %8s %12s' % ('image', 'fftpack (s)', 'basis (s)', 'speedup', 'max error'))
+
+    total_old, total_new = 0, 0
+    for name, channel in channels:
+        patches = new_utils.extract_patches(np.float64(channel), 8)
+
+        old_forward, old_dct = timeit(fftpack_dct, patches)
+        new_forward, new_dct = timeit(new_utils.dct, patches)
+        old_inverse, _ = timeit(fftpack_idct, old_dct)
+        new_inverse, restored = timeit(new_utils.idct, new_dct)
+
+        error = max(np.abs(old_dct - new_dct).max(), np.abs(restored - patches).max())
+        old_time, new_time = old_forward + old_inverse, new_forward + new_inverse
+        total_old += old_time
+        total_new += new_time
+        print('%-28s %12.5f %12.5f %7.2fx %12.2e' % (name, old_time, new_time, old_time / new_time, error))
+
+    print('%-28s %12.5f %12.5f %7.2fx' % ('total', total_old, total_new, total_old / total_new))
+    print()
+
+
+# compare the strided block views with the split/concatenate blocking
+# the whole forward and backward process is measured since that is where copies were made
+def benchmark_blocks(channels):
+    print('forward + backward process, best of 5 runs, peak memory in MB')
+    print('%-28s %10s %10s %10s %10s %10s' % ('image', 'split (s)', 'view (s)', 'split MB', 'view MB', 'identical'))
+
+    total_old, total_new = 0, 0
+    for name, channel in channels:
+        old_forward, old_dct = timeit(split_forward_process, channel)
+        new_forward, new_dct = timeit(new_utils.forwardProcess, channel)
+        old_backward, old_restored = timeit(concatenate_backward_process, old_dct)
+        new_backward, new_restored = timeit(new_utils.backwardProcess, new_dct)
+
+        old_peak = max(peak_memory(split_forward_process, channel), peak_memory(concatenate_backward_process, old_dct))
+        new_peak = max(peak_memory(new_utils.forwardProcess, channel), peak_memory(new_utils.backwardProcess, new_dct))
+
+        identical = np.array_equal(split_extract_patches(np.float64(channel), 8), new_utils.extract_patches(channel, 8))
+        identical = identical and np.array_equal(old_restored, new_restored)
+        old_time, new_time = old_forward + old_backward, new_forward + new_backward
+        total_old += old_time
+        total_new += new_time
+        print('%-28s %10.5f %10.5f %10.2f %10.2f %10s' % (name, old_time, new_time, old_peak / 2**20, new_peak / 2**20, identical))
+
+    print('%-28s %10.5f %10.5f' % ('total', total_old, total_new))
+    print()
+
+
+# compare building watermarked images in the pixels with the inverse dct of every image
+# a random watermark is embedded in the red channel at a few positions
+def benchmark_embed(channels, positions=(5, 20, 63)):
+    print('embed all T values, best of 3 runs')
+    print('%-28s %10s %12s %12s %8s %10s' % ('image', 'candidates', 'dct (s)', 'pixel (s)', 'speedup', 'identical'))
+
+    random = np.random.default_rng(0)
+    total_old, total_new = 0, 0
+    for name, channel in channels[2::3]:
+        image_dct = new_utils.forwardProcess(channel)
+        mark = random.choice([-1, 1], size=image_dct.shape[:2])
+        old_time, new_time, candidates, identical = 0, 0, 0, True
+        for position in positions:
+            b, t = new_utils.find_value_t(image_dct, 2, position)
+            old, old_images = timeit(dct_embed, channel, image_dct, mark.copy(), t, b, runs=3)
+            new, new_images = timeit(pixel_embed, channel, image_dct, mark.copy(), t, b, runs=3)
+            old_time, new_time = old_time + old, new_time + new
+            candidates += len(new_images)
+            identical = identical and np.array_equal(old_images, new_images)
+
+        total_old += old_time
+        total_new += new_time
+        print('%-28s %10d %12.5f %12.5f %7.2fx %10s' % (name, candidates, old_time, new_time, old_time / new_time, identical))
+
+    print('%-28s %10s %12.5f %12.5f %7.2fx' % ('total', '', total_old, total_new, total_old / total_new))
+    print()
+
+
+# compare the sparse extraction (coefficient b only) with the full dct of every candidate
+# candidates are the images built by pixel_embed, like the verification in the embedding GUI
+def benchmark_extract(channels, positions=(5, 20, 63)):
+    print('extract all T candidates, best of 3 runs')
+    print('%-28s %10s %12s %12s %8s %10s' % ('image', 'candidates', 'full (s)', 'sparse (s)', 'speedup', 'identical'))
+
+    random = np.random.default_rng(0)
+    total_old, total_new = 0, 0
+    for name, channel in channels[2::3]:
+        h, w = channel.shape
+        image_dct = new_utils.forwardProcess(channel)
+        mark = random.choice([-1, 1], size=image_dct.shape[:2])
+        old_time, new_time, candidates, identical = 0, 0, 0, True
+        for position in positions:
+            b, t = new_utils.find_value_t(image_dct, 2, position)
+            images = pixel_embed(channel, image_dct, mark.copy(), t, b).reshape(-1, h, w)
+            old, (old_images, old_marks) = timeit(dct_extract, images, t, b, runs=3)
+            new, (new_images, new_marks) = timeit(sparse_extract, images, t, b, runs=3)
+            old_time, new_time = old_time + old, new_time + new
+            candidates += len(images)
+            identical = identical and np.array_equal(old_images, new_images) and np.array_equal(old_marks, new_marks)
+
+        total_old += old_time
+        total_new += new_time
+        print('%-28s %10d %12.5f %12.5f %7.2fx %10s' % (name, candidates, old_time, new_time, old_time / new_time, identical))
+
+    print('%-28s %10s %12.5f %12.5f %7.2fx' % ('total', '', total_old, total_new, total_old / total_new))
+    print()
+
+
+# recover one watermarked image per position with the whole image round trip (extracted_images) and with
+# verify_blocks, which only recovers the blocks that can fail, both must give the same images
+def benchmark_verify(channels, positions=(5, 20, 63)):
+    print('recover watermarked images, best of 3 runs')
+    print('%-28s %8s %12s %12s %8s %10s %10s' % ('image', 'images', 'full (s)', 'blocks (s)', 'speedup', 'failed', 'identical'))
+
+    random = np.random.default_rng(0)
+    total_old, total_new = 0, 0
+    for name, channel in channels[2::3]:
+        image_dct = new_utils.forwardProcess(channel)
+        mark = random.choice([-1, 1], size=image_dct.shape[:2])
+        old_time, new_time, failed, identical = 0, 0, 0, True
+        for position in positions:
+            b, t = new_utils.find_value_t(image_dct, 2, position)
+            _, image = next(embedded_images(channel, image_dct, mark, 8, t, b, [t]))
+            old, (_, _, old_image, old_mark) = timeit(lambda: next(extracted_images([(t, image)], 8, b, 3994)), runs=3)
+            new, (new_image, new_mark, new_failed) = timeit(verify_blocks, channel, 0, image, mark, t, b, 3994, runs=3)
+            old_time, new_time = old_time + old, new_time + new
+            failed += new_failed.sum()
+            identical = identical and np.array_equal(old_image, new_image) and np.array_equal(old_mark, new_mark)\
+                        and np.array_equal(new_utils.extract_patches(old_image != channel, 8).any(axis=(2, 3)), new_failed)
+
+        total_old += old_time
+        total_new += new_time
+        print('%-28s %8d %12.5f %12.5f %7.2fx %10d %10s' % (name, len(positions), old_time, new_time, old_time / new_time, failed, identical))
+
+    print('%-28s %8s %12.5f %12.5f %7.2fx' % ('total', '', total_old, total_new, total_old / total_new))
+    print()
+
+
+# choose T like evaluate_t_values, but every T value is embedded and extracted before the next one is built
+# returns [T, psnr watermarked, psnr recovered, psnr watermark, score of this channel and mask]
+def built_t_value(channel, channel_dct, mask, mask_name, normalized_mark, compare_mark, t, b, key, multipliers, depth=3):
+    h, w = channel.shape
+    size = h * w * depth
+    mask = np.reshape(np.broadcast_to(np.asarray(mask, dtype=np.uint8), (h, w)), -1)
+
+    T, psnrs = [], []
+    for value, embedded, recovered, mark in extracted_images(embedded_images(channel, channel_dct, normalized_mark, 8, t, b), 8, b, key):
+        imper_sse, recovered_sse = metrics.stack_sse([embedded.reshape(-1), recovered.reshape(-1) ^ mask], channel)
+        T.append(value)
+        psnrs.append([new_utils.psnr_from_sse(imper_sse, size), new_utils.psnr_from_sse(recovered_sse, size), new_utils.psnr(compare_mark, mark)])
+
+    psnrs = np.array(psnrs)
+    chosen = scoring.best_index(scoring.candidate_scores(psnrs[:, 0], psnrs[:, 1], psnrs[:, 2], mask_name, multipliers))
+    psnr1, psnr2, psnr3 = psnrs[chosen].tolist()
+    return [T[chosen], psnr1, psnr2, psnr3, scoring.candidate_scores(psnr1, psnr2, None, mask_name, multipliers).item()]
+
+
+# compare choosing T by building and extracting the images of every T value with evaluate_t_values
+# (psnrs from the groups of pixels), both must choose the same T with the same psnrs
+def benchmark_tsearch(channels, positions=(5, 20, 63)):
+    print('choose T with every mask')
+    print('%-28s %8s %12s %12s %8s %10s' % ('image', 'choices', 'built (s)', 'groups (s)', 'speedup', 'identical'))
+
+    multipliers = {'imper': 1, 'recovered': 5, 'mask': 1, 'mark': 3}
+    random = np.random.default_rng(0)
+    total_old, total_new, total_identical, total_choices = 0, 0, 0, 0
+    for name, channel in channels[2::3]:
+        old_time, new_time, identical, choices = 0, 0, 0, 0
+        for mask_name, value in (('mask0', 0), ('mask15', 15), ('mask16', 16), ('mask31', 31)):
+            mask = np.full(channel.shape, value, dtype=np.uint8)
+            image_dct = new_utils.forwardProcess(channel ^ mask)
+            mark = random.choice([-1, 1], size=image_dct.shape[:2])
+            compare_mark = new_utils.image_scramble(np.uint8(mark > 0), 3994) * 255
+            for position in positions:
+                b, t = new_utils.find_value_t(image_dct, 2, position)
+                arguments = (channel, image_dct, mask, mask_name, mark, compare_mark, t, b, 3994, multipliers)
+                old, old_choice = timeit(built_t_value, *arguments, runs=1)
+                new, new_choice = timeit(evaluate_t_values, *arguments, runs=1)
+                old_time, new_time = old_time + old, new_time + new
+                identical += old_choice == new_choice
+                choices += 1
+
+        total_old, total_new = total_old + old_time, total_new + new_time
+        total_identical, total_choices = total_identical + identical, total_choices + choices
+        print('%-28s %8d %12.5f %12.5f %7.2fx %10s' % (name, choices, old_time, new_time, old_time / new_time, '%d/%d' % (identical, choices)))
+
+    print('%-28s %8d %12.5f %12.5f %7.2fx %10s' % ('total', total_choices, total_old, total_new, total_old / total_new, '%d/%d' % (total_identical, total_choices)))
+    print()
+
+
+# choose T from the exact psnrs of every T value (see t_value_errors)
+# returns the index of the chosen T value and its psnrs
+def every_t_value(channel, channel_dct, mask, mask_name, normalized_mark, t_values, b, multipliers, depth=3):
+    psnrs = np.array(errors_psnrs(t_value_errors(channel, channel_dct, mask, normalized_mark, t_values, b), channel.size * depth,
+                                  channel_dct.shape[0] * channel_dct.shape[1]))
+    chosen = scoring.best_index(scoring.candidate_scores(psnrs[:, 0], psnrs[:, 1], psnrs[:, 2], mask_name, multipliers))
+    return chosen, psnrs[chosen].tolist()
+
+
+# compare choosing T from the exact psnrs of every T value with only verifying the T values whose predicted score
+# can win (see best_t_value), both must choose the same T with the same psnrs
+# a random watermark is embedded in the red channel of colour images with every mask
+def benchmark_predict(channels, positions=(2, 5, 10, 20, 39)):
+    print('choose T with every mask, verifying every T value and the ones that can win')
+    print('%-28s %8s %12s %12s %8s %10s %10s' % ('image', 'choices', 'all (s)', 'pruned (s)', 'speedup', 'verified', 'identical'))
+
+    multipliers = {'imper': 1, 'recovered': 5, 'mask': 1, 'mark': 3}
+    random = np.random.default_rng(0)
+    total_old, total_new, total_verified, total_values, total_identical, total_choices = 0, 0, 0, 0, 0, 0
+    for name, channel in channels[2:len(channels) // 2:3]:
+        old_time, new_time, verified, values, identical, choices = 0, 0, 0, 0, 0, 0
+        for mask_name, value in (('mask0', 0), ('mask15', 15), ('mask16', 16), ('mask31', 31)):
+            mask = np.full(channel.shape, value, dtype=np.uint8)
+            image_dct = new_utils.forwardProcess(channel ^ mask)
+            mark = random.choice([-1, 1], size=image_dct.shape[:2])
+            for position in positions:
+                b, t = new_utils.find_value_t(image_dct, 2, position)
+                arguments = (channel, image_dct, mask, mask_name, mark, get_t_values(t), b, multipliers)
+                old, old_choice = timeit(every_t_value, *arguments, runs=1)
+                new, new_choice = timeit(best_t_value, *arguments, runs=1)
+                old_time, new_time = old_time + old, new_time + new
+                verified, values = verified + new_choice[2], values + len(get_t_values(t))
+                identical += old_choice == tuple(new_choice[:2])
+                choices += 1
+
+        total_old, total_new, total_verified, total_values = total_old + old_time, total_new + new_time, total_verified + verified, total_values + values
+        total_identical, total_choices = total_identical + identical, total_choices + choices
+        print('%-28s %8d %12.5f %12.5f %7.2fx %10s %10s' % (name, choices, old_time, new_time, old_time / new_time, '%d/%d' % (verified, values),
+                                                           '%d/%d' % (identical, choices)))
+
+    print('%-28s %8d %12.5f %12.5f %7.2fx %10s %10s' % ('total', total_choices, total_old, total_new, total_old / total_new,
+                                                       '%d/%d' % (total_verified, total_values), '%d/%d' % (total_identical, total_choices)))
+    print()
+
+
+# search the embedding position of colour images with every channel and mask, in this process and with a pool
+# of processes (one per core), both must find the same position with the same score
+def benchmark_parallel(channels, positions=range(1, 64, 4)):
+    workers = os.cpu_count()
+    print('search embedding position with %d workers' % workers)
+    print('%-28s %8s %12s %12s %8s %10s' % ('image', 'jobs', 'serial (s)', 'pool (s)', 'speedup', 'identical'))
+
+    multipliers = {'imper': 1, 'recovered': 5, 'mask': 1, 'mark': 3}
+    random = np.random.default_rng(0)
+    total_old, total_new = 0, 0
+    for path in sorted(glob.glob(os.path.join(images_folder, '*', '*.png')))[::4]:
+        image = cv2.imread(path)
+        channels = dict(zip(('r', 'g', 'b'), cv2.split(image)))
+        masks = {'mask0': 0, 'mask15': 15, 'mask16': 16, 'mask31': 31}
+        dcts = {c: {m: new_utils.forwardProcess(channels[c] ^ np.uint8(v)) for m, v in masks.items()} for c in channels}
+        maximums = {c: {m: new_utils.maximum_dct_values(dcts[c][m]) for m in masks} for c in channels}
+        mark = random.choice([-1, 1], size=dcts['r']['mask0'].shape[:2])
+        compare_mark = new_utils.image_scramble(np.uint8(mark > 0), 3994) * 255
+
+        results = []
+        for n in (1, workers):
+            start = time.perf_counter()
+            with JobPool(channels, dcts, masks, mark, compare_mark, 3994, multipliers, maximums, n) as pool:
+                results.append(pool.search_position(2, positions))
+            results.append(time.perf_counter() - start)
+
+        old_choice, old_time, new_choice, new_time = results
+        total_old, total_new = total_old + old_time, total_new + new_time
+        jobs = len(positions) * 6
+        print('%-28s %8d %12.5f %12.5f %7.2fx %10s' % (os.path.basename(path), jobs, old_time, new_time, old_time / new_time, old_choice == new_choice))
+
+    print('%-28s %8s %12.5f %12.5f %7.2fx' % ('total', '', total_old, total_new, total_old / total_new))
+    print()
+
+
+# score a grid of psnrs (positions x T values x channels and masks) with the scalar functions and with the array ones
+def benchmark_scoring(channels, shape=(63, 40, 6)):
+    print('score a grid of %s candidates' % ' x '.join(map(str, shape)))
+    print('%12s %12s %8s %10s' % ('scalar (s)', 'array (s)', 'speedup', 'identical'))
+
+    multipliers = {'imper': 1, 'recovered': 5, 'mask': 1, 'mark': 3}
+    random = np.random.default_rng(0)
+    psnrs = np.round(random.uniform(0, 110, (3,) + shape), 1)
+    masks = np.resize(['mask0', 'mask0', 'mask0', 'mask15', 'mask16', 'mask31'], shape)
+
+    def scalar_scores():
+        return [new_utils.evaluate_psnr(psnr1, multipliers['imper']) + new_utils.evaluate_psnr(psnr2, multipliers['recovered'])
+                + new_utils.evaluate_mask(mask_name, multipliers['mask']) + new_utils.evaluate_psnr_mark(psnr3, multipliers['mark'])
+                for psnr1, psnr2, psnr3, mask_name in zip(*[values.ravel().tolist() for values in psnrs], masks.ravel().tolist())]
+
+    old_time, old_scores = timeit(scalar_scores, runs=1)
+    new_time, new_scores = timeit(scoring.candidate_scores, *psnrs, masks, multipliers, runs=3)
+    print('%12.5f %12.5f %7.2fx %10s' % (old_time, new_time, old_time / new_time, np.array_equal(old_scores, new_scores.ravel())))
+    print()
+
+
+# choose the candidate of colour images at some positions with every channel and mask evaluated and with
+# the clipping prefilter, both must choose the same candidate
+def benchmark_prefilter(channels, positions=(1, 20, 40, 63)):
+    print('choose channel and mask with and without the clipping prefilter')
+    print('%-28s %8s %8s %12s %12s %8s %10s' % ('image', 'jobs', 'pruned', 'all (s)', 'prefilter (s)', 'speedup', 'identical'))
+
+    multipliers = {'imper': 1, 'recovered': 5, 'mask': 1, 'mark': 3}
+    random = np.random.default_rng(0)
+    total_old, total_new = 0, 0
+    for path in sorted(glob.glob(os.path.join(images_folder, '*', '*.png'))):
+        image = cv2.imread(path)
+        masks = engine.define_masks()
+        channels, dcts, maximums = engine.calculate_dcts(image, masks)
+        mark = random.choice([-1, 1], size=dcts['r']['mask0'].shape[:2])
+        compare_mark = new_utils.image_scramble(np.uint8(mark > 0), 3994) * 255
+
+        old_time, new_time, pruned, identical = 0, 0, 0, True
+        with JobPool(channels, dcts, masks, mark, compare_mark, 3994, multipliers, maximums, 1) as pool:
+            for position in positions:
+                t_s = engine.find_t_values(dcts, maximums, masks, 2, position)
+                duration, old_candidates = timeit(engine.find_candidates, pool, t_s, False, runs=1)
+                old_time += duration
+                t_s = engine.find_t_values(dcts, maximums, masks, 2, position)
+                duration, new_candidates = timeit(engine.find_candidates, pool, t_s, True, runs=1)
+                new_time += duration
+                pruned += len(old_candidates) - len(new_candidates)
+                identical &= engine.choose_candidate(old_candidates, masks) == engine.choose_candidate(new_candidates, masks)
+
+        total_old, total_new = total_old + old_time, total_new + new_time
+        print('%-28s %8d %8d %12.5f %12.5f %7.2fx %10s' % (os.path.basename(path), len(positions) * 6, pruned, old_time, new_time,
+                                                           old_time / new_time, identical))
+
+    print('%-28s %8s %8s %12.5f %12.5f %7.2fx' % ('total', '', '', total_old, total_new, total_old / total_new))
+    print()
+
+
+# watermark colour images with the dcts in memory and memory mapped in a store, with one and more workers
+# memory is the peak allocated while calculating the dcts, the results must be identical
+def benchmark_store(channels, position=20):
+    print('watermark with the dcts in memory and in a store')
+    print('%-28s %12s %12s %12s %12s %10s' % ('image', 'memory (MB)', 'store (MB)', 'memory (s)', 'store (s)', 'identical'))
+
+    watermark = np.ones((512, 512), dtype=np.uint8) * 255
+    masks = engine.define_masks()
+    store = tempfile.mkdtemp()
+    try:
+        for path in sorted(glob.glob(os.path.join(images_folder, '*', '*.png'))):
+            image = cv2.imread(path)
+            memory_peak = peak_memory(engine.calculate_dcts, image, masks)
+            store_peak = peak_memory(engine.calculate_dcts, image, masks, store)
+
+            identical = True
+            for workers in (1, 2):
+                memory_time, expected = timeit(engine.watermark_image, image, watermark, position=position, workers=workers, runs=1)
+                store_time, result = timeit(engine.watermark_image, image, watermark, position=position, workers=workers, store=store, runs=1)
+                identical &= all(np.array_equal(result[name], expected[name]) for name in expected)
+
+            print('%-28s %12.1f %12.1f %12.5f %12.5f %10s' % (os.path.basename(path), memory_peak / 2**20, store_peak / 2**20, memory_time,
+                                                               store_time, identical))
+    finally:
+        shutil.rmtree(store)
+    print()
+
+
+# calculate the dcts of colour images without cache, then with a cache that has them in memory
+# and with a new cache that only has them on disk, the dcts and maximums must be identical
+def benchmark_cache(channels):
+    print('calculate dcts without cache and from the memory and disk tiers of a cache')
+    print('%-28s %12s %12s %12s %10s' % ('image', 'none (s)', 'memory (s)', 'disk (s)', 'identical'))
+
+    masks = engine.define_masks()
+    folder = tempfile.mkdtemp()
+    try:
+        cache = DctCache(folder=folder)
+        for path in sorted(glob.glob(os.path.join(images_folder, '*', '*.png'))):
+            image = cv2.imread(path)
+            none_time, expected = timeit(engine.calculate_dcts, image, masks)
+            engine.calculate_dcts(image, masks, cache=cache)
+            memory_time, from_memory = timeit(engine.calculate_dcts, image, masks, cache=cache)
+            disk_time, from_disk = timeit(engine.calculate_dcts, image, masks, cache=DctCache(folder=folder), runs=1)
+
+            identical = all(np.array_equal(result[i][c][m], expected[i][c][m]) for result in (from_memory, from_disk)
+                            for i in (1, 2) for c in expected[1] for m in masks)
+            print('%-28s %12.5f %12.5f %12.5f %10s' % (os.path.basename(path), none_time, memory_time, disk_time, identical))
+        print('hits and misses', cache.counters)
+    finally:
+        shutil.rmtree(folder)
+    print()
+
+
+# watermark colour images with float64 and float32 dcts, memory is the peak allocated while calculating the dcts
+# every result (images, code, psnrs, reversibility) must be identical
+def benchmark_precision(channels, positions=(5, 20, 63)):
+    print('watermark with float64 and float32 dcts')
+    print('%-28s %12s %12s %12s %12s %10s %10s' % ('image', 'float64 (MB)', 'float32 (MB)', 'float64 (s)', 'float32 (s)', 'reversible', 'identical'))
+
+    watermark = np.ones((512, 512), dtype=np.uint8) * 255
+    masks = engine.define_masks()
+    for path in sorted(glob.glob(os.path.join(images_folder, '*', '*.png'))):
+        image = cv2.imread(path)
+        memory64 = peak_memory(engine.calculate_dcts, image, masks)
+        memory32 = peak_memory(engine.calculate_dcts, image, masks, dtype=np.float32)
+
+        time64, time32, reversible, identical = 0, 0, 0, True
+        for position in positions:
+            duration, expected = timeit(engine.watermark_image, image, watermark, position=position, workers=1, runs=1)
+            time64 += duration
+            duration, result = timeit(engine.watermark_image, image, watermark, position=position, workers=1, dtype=np.float32, runs=1)
+            time32 += duration
+            reversible += result['reversible']
+            identical &= all(np.array_equal(result[name], expected[name]) for name in expected)
+
+        print('%-28s %12.1f %12.1f %12.5f %12.5f %10s %10s' % (os.path.basename(path), memory64 / 2**20, memory32 / 2**20, time64, time32,
+                                                               '%d/%d' % (reversible, len(positions)), identical))
+    print()
+
+
+# watermark colour images at some positions without and with a workspace, the buffers of the workspace are counted
+# after the first position and after the others (same size, so nothing new should be allocated), results must be identical
+def benchmark_workspace(channels, positions=(5, 20, 40, 63)):
+    print('watermark again without and with a workspace')
+    print('%-28s %14s %10s %12s %14s %10s' % ('image', 'first', 'again', 'none (s)', 'workspace (s)', 'identical'))
+
+    watermark = np.ones((512, 512), dtype=np.uint8) * 255
+    for path in sorted(glob.glob(os.path.join(images_folder, '*', '*.png'))):
+        image = cv2.imread(path)
+        workspace = Workspace()
+
+        none_time, workspace_time, identical, first = 0, 0, True, None
+        for position in positions:
+            duration, expected = timeit(engine.watermark_image, image, watermark, position=position, workers=1, runs=1)
+            none_time += duration
+            duration, result = timeit(engine.watermark_image, image, watermark, position=position, workers=1, workspace=workspace, runs=1)
+            workspace_time += duration
+            identical &= all(np.array_equal(result[name], expected[name]) for name in expected)
+            if first is None:
+                first = (workspace.allocations, workspace.allocated_bytes)
+
+        print('%-28s %14s %10s %12.5f %14.5f %10s' % (os.path.basename(path), '%d (%.1f MB)' % (first[0], first[1] / 2**20),
+                                                      '%d' % (workspace.allocations - first[0]), none_time, workspace_time, identical))
+    print()
+
+
+# change one setting at a time like the GUI does and update the pipeline, against watermarking again from the start
+# stages is the number of stages calculated again, the code and images must be the ones of engine.watermark_image
+def benchmark_pipeline(channels, changes=(('key', 1234), ('position', 20), ('tvalue', 3), ('multipliers', dict(engine.multipliers, mark=5)))):
+    print('update the pipeline after one change against watermarking again')
+    print('%-28s %-12s %8s %12s %12s %10s' % ('image', 'change', 'stages', 'full (s)', 'update (s)', 'identical'))
+
+    watermark = np.ones((512, 512), dtype=np.uint8) * 255
+    for path in sorted(glob.glob(os.path.join(images_folder, '*', '*.png')))[:4]:
+        image = cv2.imread(path)
+        pipeline = watermark_pipeline()
+        settings = {'image': image, 'watermark': watermark, 'key': 7777, 'position': 63, 'tvalue': 2, 'multipliers': dict(engine.multipliers),
+                    'masks': engine.define_masks(), 'workers': 1, 'cache': None, 'dtype': np.float64, 'workspace': Workspace()}
+        pipeline.set(**settings)
+        pipeline.get('code')
+
+        # the watermark changes last, every other change is made with the first watermark
+        for name, value in changes + (('watermark', cv2.resize(image[:, :, 0], (512, 512)) // 128 * 255),):
+            pipeline.set(**settings)
+            pipeline.get('code')
+            runs = sum(pipeline.runs.values())
+
+            pipeline.set(**{name: value})
+            start = time.perf_counter()
+            code, images = pipeline.get('code'), pipeline.get('images')
+            update_time = time.perf_counter() - start
+            changed = dict(settings, **{name: value})
+            full_time, expected = timeit(engine.watermark_image, image, changed['watermark'], changed['key'], changed['position'], changed['tvalue'],
+                                         changed['multipliers'], workers=1, runs=1)
+
+            identical = code == expected['code'] and np.array_equal(images[0], expected['watermarked_image'])
+            print('%-28s %-12s %8d %12.5f %12.5f %10s' % (os.path.basename(path), name, sum(pipeline.runs.values()) - runs, full_time, update_time,
+                                                          identical))
+    print()
+
+
+# watermark colour images with the masks in other orders, the mask 0 must be looked at first whatever its place
+# every result but the mask digit of the code must be the one of the default order (lena chooses mask16 at 10 and 40)
+def benchmark_masks(channels, orders=((15, 0, 16, 31), (31, 16, 15, 0)), positions=(10, 40, 63)):
+    print('watermark with the masks in other orders')
+    print('%-28s %-14s %8s %8s %8s %10s' % ('image', 'masks', 'position', 'channel', 'mask', 'identical'))
+
+    watermark = np.ones((512, 512), dtype=np.uint8) * 255
+    for path, position in itertools.product(sorted(glob.glob(os.path.join(images_folder, 'color', '*.png'))), positions):
+        image = cv2.imread(path)
+        expected = engine.watermark_image(image, watermark, position=position, workers=1)
+        for order in orders:
+            result = engine.watermark_image(image, watermark, position=position, workers=1, masks=order)
+            # the code only differs by the mask digit, the index of the mask in the order
+            digit = 2 + len(str(image.shape[0])) + len(str(image.shape[1])) + 1
+            code = expected['code'][:digit] + str(list(engine.define_masks(order)).index(expected['mask'])) + expected['code'][digit + 1:]
+            identical = result['code'] == code and all(np.array_equal(result[name], expected[name]) for name in expected if name != 'code')
+            print('%-28s %-14s %8d %8s %8s %10s' % (os.path.basename(path), ','.join(map(str, order)), position, result['channel'], result['mask'],
+                                                    identical))
+    print()
+
+
+# images (512 x 512 or a 203 x 317 crop at (top, left)), watermark, position and the code the old version gave
+# positions 10, 14 and 39 are b=32, 4 and 36 where coefficients are multiples of 1/8, so some are exactly 0 or x.5
+# and every pixel of T=4 (mod 8) is a tie (the marchet crop has T values with ties that score close to the chosen one)
+baseline_cases = (('peppers.png', None, 'lena_gray.png', 10, '3512351220032001390006184571183962'),
+                  ('desktop.png', None, 'lena_gray.png', 10, '3512351200032000110006203659198122'),
+                  ('lena.png', (50, 0), 'cat_gray.png', 10, '32033317000320005400055644149688'),
+                  ('lena.png', (100, 0), 'cat_gray.png', 10, '32033317010320008000055709949514'),
+                  ('lena.png', (200, 180), 'cat_gray.png', 10, '32033317200320004200054186148612'),
+                  ('hall1.png', (37, 51), 'cat_gray.png', 14, '32033317000040014200054376146224'),
+                  ('arbre.png', (37, 51), 'lena_gray.png', 39, '32033317200360010200054192748550'),
+                  ('marchet.png', (37, 51), 'lena_gray.png', 39, '32033317000360011000054107748660'))
+
+
+# watermark images and compare with the old fftpack process: the code, the maximums giving the T values of every
+# channel and mask, the bits and the channel extracted from the watermarked image, and the watermarked channel
+# the channel is also watermarked and extracted with the closest smaller T giving ties, they must be rounded like before
+def benchmark_baseline(channels, cases=baseline_cases):
+    print('compare with the old fftpack process')
+    print('%-12s %10s %8s %-36s %9s %9s %6s %10s %9s %6s %13s %13s' % ('image', 'size', 'position', 'code', 'same code', 'maximums', 'bits',
+                                                                       'recovered', 'embedded', 'tie T', 'tie embedded', 'tie recovered'))
+
+    masks = engine.define_masks()
+    for name, crop, watermark_name, position, old_code in cases:
+        image = cv2.imread(os.path.join(images_folder, 'color', name))
+        if crop is not None:
+            image = image[crop[0]:crop[0] + 203, crop[1]:crop[1] + 317]
+        watermark = cv2.threshold(cv2.imread(os.path.join(images_folder, 'gray', watermark_name), 0), 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)[1]
+        result = engine.watermark_image(image, watermark, position=position, workers=1)
+
+        # maximums of every channel and mask
+        image_channels, dcts, maximums = engine.calculate_dcts(image, masks)
+        same_maximums = all(np.array_equal(maximums[channel_name][_id], np.round(np.abs(split_forward_process(channel ^ masks[_id])).reshape(-1, 64).max(axis=0)))
+                            for channel_name, channel in image_channels.items() for _id in masks)
+
+        # the chosen candidate, T is read from the code (after the sizes, channel, mask and b)
+        channel, mask = image_channels[result['channel']], masks[result['mask']]
+        digit = 7 + len(str(image.shape[0])) + len(str(image.shape[1]))
+        b, t = new_utils.zigzag_indexes[position], int(result['code'][digit:digit + 5])
+        mark, _ = engine.prepare_watermark(watermark, (-(-image.shape[0] // 8), -(-image.shape[1] // 8)), 7777)
+        watermarked = engine.split_channels(result['watermarked_image'])[result['channel']]
+
+        recovered, bits = fftpack_extract(watermarked, t, b)
+        same_bits = np.array_equal(bits, new_utils.coefficient_signs(new_utils.coefficient_values(watermarked, b), new_utils.extract_patches(watermarked, 8), b))
+        same_recovered = np.array_equal(recovered ^ mask, engine.split_channels(result['recovered_image'])[result['channel']])
+        # the watermarked channel is the masked one, the mask is only removed from the recovered channel
+        embedded = fftpack_embed(channel ^ mask, mark, t, b)
+
+        tie_t = t - (t - 4) % 8
+        _, tie_embedded = next(embedded_images(channel ^ mask, dcts[result['channel']][result['mask']], mark, 8, tie_t, b, [tie_t]))
+        _, _, tie_recovered, _ = next(extracted_images([(tie_t, tie_embedded)], 8, b, 7777))
+        print('%-12s %10s %8d %-36s %9s %9s %6s %10s %9d %6d %13d %13d' % (name, '%dx%d' % image.shape[:2], position, result['code'], result['code'] == old_code,
+                                                                           same_maximums, same_bits, same_recovered, (embedded != watermarked).sum(), tie_t,
+                                                                           (tie_embedded != fftpack_embed(channel ^ mask, mark, tie_t, b)).sum(),
+                                                                           (tie_recovered != fftpack_extract(tie_embedded, tie_t, b)[0]).sum()))
+    print()
+
+
+benchmarks = {
+    'dct': benchmark_dct,
+    'blocks': benchmark_blocks,
+    'embed': benchmark_embed,
+    'extract': benchmark_extract,
+    'verify': benchmark_verify,
+    'tsearch': benchmark_tsearch,
+    'predict': benchmark_predict,
+    'parallel': benchmark_parallel,
+    'scoring': benchmark_scoring,
+    'prefilter': benchmark_prefilter,
+    'store': benchmark_store,
+    'cache': benchmark_cache,
+    'precision': benchmark_precision,
+    'workspace': benchmark_workspace,
+    'masks': benchmark_masks,
+    'pipeline': benchmark_pipeline,
+    'baseline': benchmark_baseline,
+}
+
+
+# usage: python benchmark.py [benchmark names...]
+def main():
+    names = sys.argv[1:] or list(benchmarks)
+    channels = load_channels()
+    for name in names:
+        benchmarks[name](channels)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+import numpy as np
+from new_utils import maximum_dct_values
+
+
+# dcts kept between images and runs, so reopening an image (or watermarking it again with other settings)
+# does not transform it again
+# a dct is found by a hash of the image content, its channel, its mask, the block size and its type
+# there are two tiers, both dropping the least recently used dcts when they are full:
+# - memory: arrays in memory, up to memory_size bytes
+# - disk (only with a folder): .npy files memory mapped when used, up to disk_size bytes, they are kept between runs
+#   (dcts bigger than the memory tier are written straight in their file)
+# dcts given by the cache are read only, they are shared by everything that asks for them
+# the coefficient maximums of the dcts (64 values each) are kept too, so a hit reads nothing, on disk they are
+# a small .npy file next to the file of their dct (removed with it)
+
+# number of maximum tables kept
+maximums_count = 4096
+# temporary files not written for that many seconds are left by a process that stopped while writing them
+temporary_age = 3600
+
+
+# hash of an image, its shape and type are part of it
+def image_digest(image):
+    image = np.ascontiguousarray(image)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(('%s %s' % (image.shape, image.dtype.str)).encode())
+    digest.update(image.data)
+    return digest.hexdigest()
+
+
+class DctCache:
+
+    def __init__(self, memory_size=512 << 20, folder=None, disk_size=8 << 30):
+        self.memory_size = memory_size
+        self.folder = folder
+        self.disk_size = disk_size
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.tables = OrderedDict()
+        # memory hits, disk hits and misses (dcts that had to be calculated)
+        self.counters = {'memory': 0, 'disk': 0, 'miss': 0}
+
+        if folder is not None:
+            os.makedirs(folder, exist_ok=True)
+            self.remove_temporary()
+
+
+    # file of a dct in the disk tier, key is (image digest, channel, mask name, block size, type name)
+    def path(self, key):
+        return os.path.join(self.folder, '%s_%s_%s_%d_%s.npy' % key)
+
+
+    # file of the maximums of a dct in the disk tier
+    def maximums_path(self, key):
+        return self.path(key)[:-len('.npy')] + '.max.npy'
+
+
+    # dct of a key, calculate(out) is only called when no tier has it, it writes the dct in out
+    # (or returns a new array when out is None, like forwardProcess does)
+    # shape is the shape of the dct, its type is the last value of the key
+    def dct(self, key, shape, calculate):
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.counters['memory'] += 1
+            return self.memory[key]
+
+        if self.folder is not None and os.path.exists(self.path(key)):
+            # the modification time is the last use of a file
+            # another process can evict the file before it is opened, it is a miss then
+            try:
+                os.utime(self.path(key))
+                dct = np.load(self.path(key), mmap_mode='r')
+                self.counters['disk'] += 1
+                return dct
+            except FileNotFoundError:
+                pass
+
+        self.counters['miss'] += 1
+        nbytes = int(np.prod(shape)) * np.dtype(key[-1]).itemsize
+        if nbytes <= self.memory_size:
+            dct = calculate(None)
+            if self.folder is not None:
+                self.write(key, lambda out: np.copyto(out, dct), shape)
+            return self.remember(key, dct)
+
+        # too big for the memory tier, calculated straight in its file
+        if self.folder is not None:
+            self.write(key, calculate, shape)
+            return np.load(self.path(key), mmap_mode='r')
+
+        return calculate(None)
+
+
+    # maximum_dct_values of a dct given by the cache, image is the image of the dct
+    # they are read from the disk tier when the dct is there, and written there after they are calculated
+    def maximums(self, key, dct, image=None):
+        if key in self.tables:
+            self.tables.move_to_end(key)
+            return self.tables[key]
+
+        on_disk = self.folder is not None and os.path.exists(self.path(key))
+        # the maximums file can be missing or evicted by another process, they are calculated again then
+        try:
+            self.tables[key] = np.load(self.maximums_path(key)) if on_disk else None
+        except FileNotFoundError:
+            self.tables[key] = None
+        if self.tables[key] is None:
+            self.tables[key] = maximum_dct_values(dct, image)
+            if on_disk:
+                self.save(self.maximums_path(key), lambda out: np.copyto(out, self.tables[key]), self.tables[key].shape, self.tables[key].dtype)
+        if len(self.tables) > maximums_count:
+            self.tables.popitem(last=False)
+        return self.tables[key]
+
+
+    # keep a dct in the memory tier, the least recently used ones are dropped to make room
+    def remember(self, key, dct):
+        dct.flags.writeable = False
+        self.memory[key] = dct
+        self.memory_bytes += dct.nbytes
+        while self.memory_bytes > self.memory_size:
+            _, old = self.memory.popitem(last=False)
+            self.memory_bytes -= old.nbytes
+
+        return dct
+
+
+    # write a dct in the disk tier
+    def write(self, key, calculate, shape):
+        self.save(self.path(key), calculate, shape, key[-1])
+        self.evict(self.path(key))
+
+
+    # write a .npy file with calculate(out), in a temporary file first so other processes never read half a file
+    # the temporary file is removed when calculate fails
+    def save(self, path, calculate, shape, dtype):
+        temporary = '%s.%d.tmp' % (path, os.getpid())
+        try:
+            out = np.lib.format.open_memmap(temporary, mode='w+', dtype=dtype, shape=shape)
+            calculate(out)
+            out.flush()
+            del out
+            os.replace(temporary, path)
+        except BaseException:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            raise
+
+
+    # remove the least recently used dcts (with their maximums) until the disk tier fits in disk_size, but the kept one
+    # files still mapped (on windows) can not be removed, they are left for later
+    def evict(self, kept=None):
+        files = []
+        for name in os.listdir(self.folder):
+            if name.endswith('.npy') and not name.endswith('.max.npy') and os.path.join(self.folder, name) != kept:
+                path = os.path.join(self.folder, name)
+                files.append((os.path.getmtime(path), os.path.getsize(path), path))
+
+        total = sum(size for _, size, _ in files) + (os.path.getsize(kept) if kept is not None else 0)
+        for _, size, path in sorted(files):
+            if total <= self.disk_size:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+            try:
+                os.remove(path[:-len('.npy')] + '.max.npy')
+            except OSError:
+                pass
+
+        self.remove_temporary()
+
+
+    # remove the temporary files left by processes that stopped while writing them (see temporary_age)
+    def remove_temporary(self):
+        now = time.time()
+        for name in os.listdir(self.folder):
+            path = os.path.join(self.folder, name)
+            try:
+                if name.endswith('.tmp') and now - os.path.getmtime(path) > temporary_age:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+    # drop every dct of the memory tier (files of the disk tier are kept)
+    def clear(self):
+        self.memory.clear()
+        self.memory_bytes = 0
+        self.tables.clear()
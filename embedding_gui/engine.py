@@ -0,0 +1,285 @@
+import os
+import shutil
+from collections import namedtuple
+
+import cv2
+import numpy as np
+from new_utils import psnr, psnr_from_sse, find_value_t, forwardProcess, image_scramble, maximum_dct_values
+from new_algorithms import embedded_images, verify_blocks, choose_channel_and_mask
+from parallel import JobPool
+from cache import image_digest
+from workspace import workspace_buffer
+import scoring
+
+
+# watermarking without any window, ApplicationWindow and the watermark-embed command use these functions
+# (channels are named 'r', 'g', 'b' in the order of cv2.split, like the GUI always did)
+
+# default multipliers to evaluate our PSNR (see scoring)
+multipliers = scoring.default_multipliers
+
+# filters (named masks in early stage of developement) are values xored with the whole channel
+# the mask digit of the extracting code is the index of the mask in its set
+mask_set = (0, 15, 16, 31)
+mask_values = {'mask%d' % value: value for value in mask_set}
+mask_code = {_id: code for code, _id in enumerate(mask_values)}
+channel_code = {'r': 0, 'g': 1, 'b': 2}
+
+
+# masks of a set of xor values, {mask_name: value}
+# a mask is a single np.uint8 broadcast over the channel, so it costs nothing whatever the image size
+# mask0 is needed (every channel is tested with it) and the code has one digit for the mask
+# raises ValueError if the set can not be used
+def define_masks(values=mask_set):
+    values = [int(value) for value in values]
+    if 0 not in values:
+        raise ValueError('masks must contain 0')
+    if len(set(values)) != len(values) or len(values) > 10:
+        raise ValueError('masks must be at most 10 different values')
+    if min(values) < 0 or max(values) > 255:
+        raise ValueError('masks must be values from 0 to 255')
+
+    return {'mask%d' % value: np.uint8(value) for value in values}
+
+
+# mask values from a string like "0,15,16,31", checked like define_masks does
+def parse_masks(text):
+    values = tuple(int(value) for value in text.split(','))
+    define_masks(values)
+    return values
+
+
+# dct of every channel with every mask and the maximum of every coefficient of these dcts
+# with store (a folder) the dcts are memory mapped .npy files of that folder instead of arrays in memory,
+# the page cache keeps the parts that are used so big images don't need all their dcts in memory
+# with cache (a cache.DctCache) dcts of an image already seen are not calculated again, store is not used then
+# dtype is the type of the dcts, np.float32 halves their size (see watermark_image)
+# with a workspace (see workspace.Workspace) the channels and the dcts (without store and cache) are its buffers
+# returns channels[channel], dcts[channel][mask_name] and maximums[channel][mask_name]
+def calculate_dcts(image, masks, store=None, cache=None, dtype=np.float64, workspace=None):
+    channels = split_channels(image, workspace)
+    shape = (-(-image.shape[0] // 8), -(-image.shape[1] // 8), 8, 8)
+    digest = image_digest(image) if cache is not None else None
+    dcts, maximums = {}, {}
+    for channel_name, channel in channels.items():
+        dcts[channel_name], maximums[channel_name] = {}, {}
+        for _id in masks:
+            masked_channel = np.bitwise_xor(channel, masks[_id], out=workspace_buffer(workspace, 'masked', channel.shape, np.uint8))
+            calculate = lambda out, masked_channel=masked_channel: forwardProcess(image=masked_channel, patch_size=8, out=out, dtype=dtype)
+            # so changing the embedding position is only a look up in the maximums
+            if cache is not None:
+                key = (digest, channel_name, _id, 8, np.dtype(dtype).name)
+                dcts[channel_name][_id] = cache.dct(key, shape, calculate)
+                maximums[channel_name][_id] = cache.maximums(key, dcts[channel_name][_id], masked_channel)
+            else:
+                out = stored_dct(store, channel_name, _id, shape, dtype)
+                if out is None:
+                    out = workspace_buffer(workspace, 'dct %s %s' % (channel_name, _id), shape, dtype)
+                dcts[channel_name][_id] = calculate(out)
+                maximums[channel_name][_id] = maximum_dct_values(dcts[channel_name][_id], masked_channel)
+
+    return channels, dcts, maximums
+
+
+# channels of an image named like cv2.split gives them, copied in buffers of the workspace when there is one
+def split_channels(image, workspace=None):
+    if workspace is None:
+        return dict(zip(('r', 'g', 'b'), cv2.split(image)))
+
+    channels = {channel_name: workspace.buffer('channel ' + channel_name, image.shape[:2], np.uint8) for channel_name in ('r', 'g', 'b')}
+    cv2.split(image, list(channels.values()))
+    return channels
+
+
+# memory mapped .npy file (store/<channel>_<mask>.npy) for a dct of this shape and type, None without store
+def stored_dct(store, channel_name, mask_name, shape, dtype=np.float64):
+    if store is None:
+        return None
+
+    os.makedirs(store, exist_ok=True)
+    return np.lib.format.open_memmap(os.path.join(store, '%s_%s.npy' % (channel_name, mask_name)), mode='w+', dtype=dtype, shape=shape)
+
+
+# [b, t] of find_value_t for every channel and mask at an embedding position
+def find_t_values(dcts, maximums, masks, tvalue, position):
+    return {channel_name: {_id: find_value_t(dcts[channel_name][_id], tvalue, position, maximums[channel_name][_id]) for _id in masks}
+            for channel_name in dcts}
+
+
+# resize, normalize and scramble the watermark to embed it in dcts of this shape
+# returns the watermark to embed and the watermark used to compare extracted watermarks
+def prepare_watermark(watermark, dct_shape, key):
+    # resize watermark to fit embedding space
+    embedding_watermark = cv2.resize(watermark, (dct_shape[1], dct_shape[0]), cv2.INTER_CUBIC)
+    # get normalized and scrambled mark
+    embedding_watermark = (embedding_watermark / 255).astype(int)
+    # set comparaison watermark
+    compare_watermark = (embedding_watermark * 255).astype('uint8').copy()
+    # crypt image
+    embedding_watermark = image_scramble(embedding_watermark.astype('uint8'), key)
+    # set black pixels to -1
+    embedding_watermark[embedding_watermark == 0] = -1
+
+    return embedding_watermark, compare_watermark
+
+
+# a candidate is only described by its channel, mask, coefficient b, T value, psnrs and score
+# (score is the one used to choose between channels and masks), no image is kept for it
+Candidate = namedtuple('Candidate', ['channel', 'mask', 'b', 'T', 'psnr_watermarked', 'psnr_recovered', 'psnr_watermark', 'score'])
+
+
+# highest score (the one used to choose between channels and masks) a channel and mask with clipped pixels can get
+# at least clipped pixels are recovered wrong and the watermarked image is at best identical
+# psnr scores only grow with the psnr, but for one point at every tie of round, hence the extra multiplier per threshold
+def score_bound(clipped, mask_name, size, multipliers):
+    bound = scoring.candidate_scores(psnr_from_sse(0, size), psnr_from_sse(clipped, size), None, mask_name, multipliers).item()
+    return bound + len(scoring.psnr_thresholds) * (multipliers['imper'] + multipliers['recovered'])
+
+
+# choose best T of every channel and mask, every channel and mask is a job of the pool
+# t_s[channel][mask_name] are the [b, t] of find_value_t, they are updated with the chosen T values
+# with prefilter, when some channel and mask has no block that can clip, the ones that clip pixels whatever
+# T is used are only evaluated if their score bound can beat the best score of the others,
+# so the chosen candidate is the same as evaluating everything
+# the prefilter is off by default, on the test images it almost never leaves a job out and looking for the
+# clipped pixels makes the search up to 16% slower (see the prefilter benchmark), watermark-embed turns it on
+# with --prefilter for images with saturated areas
+# returns {(channel, mask_name): Candidate}, without the channels and masks that could not be chosen
+def find_candidates(pool, t_s, prefilter=False):
+    jobs, bounds = pool.jobs, {}
+    if prefilter and min(pool.multipliers['imper'], pool.multipliers['recovered']) >= 0:
+        risky = pool.clipping(t_s)
+        if 0 in risky.values():
+            clipped = pool.clipping(t_s, count=True, jobs=[job for job in pool.jobs if risky[job]])
+            bounds = {job: score_bound(count, job[1], pool.size, pool.multipliers) for job, count in clipped.items() if count}
+            jobs = [job for job in pool.jobs if job not in bounds]
+
+    results = pool.t_values(t_s, jobs=jobs)
+    best_score = max(result[-1] for result in results.values())
+    results.update(pool.t_values(t_s, jobs=[job for job in pool.jobs if job in bounds and bounds[job] >= best_score]))
+
+    candidates = {}
+    for (channel_name, _id), result in results.items():
+        candidates[(channel_name, _id)] = Candidate(channel_name, _id, t_s[channel_name][_id][0], *result)
+        t_s[channel_name][_id][1] = result[0]
+
+    return candidates
+
+
+# choose best candidate with the same rules as the GUI always used
+# all channels are tested with mask0, other masks are only tested on the red channel
+# channels and masks left out by find_candidates can not be chosen
+def choose_candidate(candidates, masks):
+    scores = {(channel_name, _id): -np.inf for _id in masks for channel_name in ('r', 'g', 'b')}
+    scores.update({name: candidate.score for name, candidate in candidates.items()})
+    chosen_channel, chosen_mask, _ = choose_channel_and_mask(scores, masks)
+    return candidates[(chosen_channel, chosen_mask)]
+
+
+# build the full rgb images of a candidate, returns watermarked image, recovered image, extracted watermark
+# and the number of blocks that are not recovered exactly (0 when the watermark is fully reversible)
+# the recovered image is only calculated on the blocks that can fail (see verify_blocks)
+# channel_dct and mask are the dct of the masked channel of the candidate and its mask
+# with a workspace the images are its buffers, they are overwritten by the next materialize with it
+def materialize(image, channel_dct, mask, candidate, normalized_mark, key, workspace=None):
+    channels = split_channels(image, workspace)
+
+    _, embedded = next(embedded_images(channels[candidate.channel], channel_dct, normalized_mark, 8, candidate.T, candidate.b, [candidate.T], workspace))
+    recovered, mark, failed = verify_blocks(channels[candidate.channel], mask, embedded, normalized_mark, candidate.T, candidate.b, key, workspace=workspace)
+
+    watermarked_channels, recovered_channels = dict(channels), dict(channels)
+    watermarked_channels[candidate.channel] = embedded
+    recovered_channels[candidate.channel] = recovered
+
+    watermarked_image = cv2.merge([watermarked_channels[c] for c in ('r', 'g', 'b')], dst=workspace_buffer(workspace, 'watermarked', image.shape, np.uint8))
+    recovered_image = cv2.merge([recovered_channels[c] for c in ('r', 'g', 'b')], dst=workspace_buffer(workspace, 'recovered', image.shape, np.uint8))
+    return watermarked_image, recovered_image, mark, int(failed.sum())
+
+
+# function to get a nice formated strings
+# useful when we construct the extracting code
+def get_formated_number_str(number, lenght):
+    return str(int(number)).zfill(lenght)
+
+
+# key taken from the LSBs of an image multiplied by its mirror
+# it is a sum over rows, so the keys of bands of rows of an image add up to the key of the image
+def lsb_key(image):
+    # get LSBs
+    another_code = image % 2
+    # multiply by mirrow
+    another_code = another_code * cv2.flip(another_code, 1)
+    # calculate sum
+    return another_code.sum()
+
+
+# construct decryption code of a watermarked image, b and T are the embedding position and T value used
+# masks is the set the mask was chosen from, the code gives the index of the mask in it
+def extraction_code(watermarked_image, key, channel_name, mask_name, b, T, masks=mask_values):
+    theight, twidth = watermarked_image.shape[:2]
+    return format_code(theight, twidth, key, lsb_key(watermarked_image), channel_name, mask_name, b, T, masks)
+
+
+# extracting code string of an image of this size, another_code is the lsb_key of the watermarked image
+def format_code(theight, twidth, key, another_code, channel_name, mask_name, b, T, masks=mask_values):
+    # xor between key and this constructed key
+    crypted_key  = int(key) ^ int(another_code)
+
+    theight, twidth = str(theight), str(twidth)
+
+    # construct extracting code string
+    return str(len(theight)) + theight + str(len(twidth)) + twidth + str(channel_code[channel_name]) + str(list(masks).index(mask_name)) + get_formated_number_str(b, 3)\
+           + get_formated_number_str(T, 5) + get_formated_number_str(len(str(crypted_key)), 4)\
+           + str(crypted_key) + str(int(another_code))
+
+
+# watermark an image with every channel and mask and keep the best one
+# position is the index of the coefficient in zigzag order, None to search the best one
+# returns a dict with the watermarked image, recovered image, extracted watermark, extracting code,
+# chosen channel, mask and position, the psnrs of the watermarked image, recovered image and watermark
+# and if the image is recovered exactly (with the number of blocks that are not)
+# masks is the set of mask values to test, store a folder where the dcts are memory mapped and cache a cache.DctCache
+# giving the dcts of images already seen (see calculate_dcts)
+# with dtype=np.float32 the dcts take half the memory and the result is the same, what float32 can not give
+# exactly is calculated again in float64 from the pixels (see maximum_dct_values and t_value_errors)
+# with a workspace (see workspace.Workspace) images of the same size are watermarked again almost without allocating,
+# the images of the result are its buffers then and are only valid until its next use
+# with prefilter the channels and masks whose clipped pixels already lose are not evaluated (see find_candidates)
+def watermark_image(image, watermark, key=7777, position=63, tvalue=2, multipliers=multipliers, workers=None, masks=mask_set, store=None, cache=None,
+                    dtype=np.float64, workspace=None, prefilter=False):
+    masks = define_masks(masks)
+    channels, dcts, maximums = calculate_dcts(image, masks, store, cache, dtype, workspace)
+    embedding_watermark, compare_watermark = prepare_watermark(watermark, dcts['r']['mask0'].shape, key)
+
+    with JobPool(channels, dcts, masks, embedding_watermark, compare_watermark, key, multipliers, maximums, workers) as pool:
+        if position is None:
+            position, _ = pool.search_position(tvalue)
+        t_s = find_t_values(dcts, maximums, masks, tvalue, position)
+        candidates = find_candidates(pool, t_s, prefilter)
+
+    # only the chosen candidate is built
+    chosen = choose_candidate(candidates, masks)
+    watermarked_image, recovered_image, display_watermark, failed_blocks = materialize(image, dcts[chosen.channel][chosen.mask], masks[chosen.mask],
+                                                                                       chosen, embedding_watermark, key, workspace)
+
+    return {'watermarked_image': watermarked_image, 'recovered_image': recovered_image, 'display_watermark': display_watermark,
+            'code': extraction_code(watermarked_image, key, chosen.channel, chosen.mask, chosen.b, chosen.T, masks),
+            'channel': chosen.channel, 'mask': chosen.mask, 'position': position, 'psnr_watermarked': chosen.psnr_watermarked,
+            'psnr_recovered': chosen.psnr_recovered, 'psnr_watermark': psnr(compare_watermark, display_watermark),
+            'reversible': failed_blocks == 0, 'failed_blocks': failed_blocks}
+
+
+# save watermarked image and its extracting code in a folder (image.png and code.txt), the folder is replaced
+def save_watermarked(folder, watermarked_image, code):
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+
+    # make folder
+    os.mkdir(folder)
+
+    # save watermarked image
+    cv2.imwrite(os.path.join(folder, 'image.png'), watermarked_image)
+
+    # save extracting code in a text file
+    with open(os.path.join(folder, 'code.txt'), 'w+') as f:
+        f.write(code)
@@ -1,14 +1,14 @@
-from PyQt5 import QtWidgets
-from mainwindow_class import ApplicationWindow
-
-import sys
-
-
-def main():
-    app = QtWidgets.QApplication(sys.argv)
-    application = ApplicationWindow()
-    application.show()
-    sys.exit(app.exec_())
-
-if __name__ == "__main__":
+from PyQt5 import QtWidgets
+from mainwindow_class import ApplicationWindow
+
+import sys
+
+
+def main():
+    app = QtWidgets.QApplication(sys.argv)
+    application = ApplicationWindow()
+    application.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
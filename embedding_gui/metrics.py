@@ -0,0 +1,63 @@
+from math import log10
+
+import cv2
+import numpy as np
+
+
+# mse and psnr of stacks of images against one reference image, one call for all images
+# sums of squared errors are exact integers calculated on the uint8 images, no float copies are made
+
+
+# peak value of 8 bits images squared
+peak = 65025
+
+# added to mse to not divide by 0 when images are identical
+psnr_epsilon = 0.000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000001
+
+# values compared by one cv2.norm call, the sum of squared errors of a chunk is at most 65536 * 65025
+# so cv2.norm gives it exactly (rounding only removes floating point noise)
+chunk_size = 1 << 16
+
+
+# sum of squared errors of every image of a stack (array or list of images) against one image
+# returns a vector of integers (floats if the images are not uint8)
+def stack_sse(images, reference):
+    reference = np.reshape(reference, -1)
+    sse = []
+
+    for image in images:
+        image = np.reshape(image, -1)
+        if image.dtype != np.uint8 or reference.dtype != np.uint8:
+            sse.append(((image.astype(float) - reference.astype(float)) ** 2).sum())
+            continue
+
+        sse.append(sum(round(cv2.norm(image[start:start + chunk_size], reference[start:start + chunk_size], cv2.NORM_L2SQR))
+                       for start in range(0, image.shape[0], chunk_size)))
+
+    return np.array(sse, dtype=None if sse else np.int64)
+
+
+# mse of every image of a stack against one image
+def stack_mse(images, reference):
+    return stack_sse(images, reference) / np.size(reference)
+
+
+# psnr from sums of squared errors (a number or a vector) of images of N values (all channels)
+# useful when only one channel is different, we don't need to build the full images
+def psnr_from_sse(sse, N):
+    if np.ndim(sse) == 0:
+        return 10 * log10(peak / (sse / N + psnr_epsilon))
+
+    # math.log10 like psnr always used, so the values are exactly the same
+    return np.array([10 * log10(peak / (value / N + psnr_epsilon)) for value in np.reshape(sse, -1)])
+
+
+# psnr of every image of a stack against one image, 0 for images with another shape
+def stack_psnr(images, reference):
+    reference = np.asarray(reference)
+    same_shape = np.array([np.shape(image) == reference.shape for image in images], dtype=bool)
+    psnrs = np.zeros(len(images))
+    if same_shape.any():
+        psnrs[same_shape] = psnr_from_sse(stack_sse([image for image, same in zip(images, same_shape) if same], reference), reference.size)
+
+    return psnrs
@@ -1,86 +1,470 @@
-import numpy as np
-import new_utils
-
-# function will handle process
-def embed(img, img_dct, normalized_mark, img_psize=8, t=10, b=10):
-    # embed parametres
-    h, w, d, _= img_dct.shape
-    img_dct = img_dct.reshape(h*w, d*d)
-    
-    
-    t = int(t)
-    # array of possible T values to test
-    T = np.arange(t, 10, -10)
-    
-    # create copies of image dct recieved since we will output
-    # a set of images with specific T values 
-    img_dct = np.repeat([img_dct], T.shape[0], axis=0)
-    # create copies of the watermark
-    # this process is necessary to have the correct shape which will allow us
-    # to add img_dct and data_to_embed without using loops and the embedding process will be correct
-    data_to_embed = np.repeat([normalized_mark.flatten()], T.shape[0], axis=0)
-    T = np.repeat(T, len(data_to_embed[0])).reshape(T.shape[0], len(data_to_embed[0]))
-    data_to_embed *= T
-
-    # embedding
-    img_dct[:, :, b] += data_to_embed
-
-    # reshape our result
-    img_dct = img_dct.reshape(T.shape[0], h * w * d * d)
-    # recover images and return all embedded images
-    restored = np.apply_along_axis(new_utils.backwardProcess, 1, img_dct, shape=(h, w))
-    restored = restored[: , :img.shape[0], :img.shape[1]]
-    return restored.reshape(restored.shape[0], restored.shape[1]*restored.shape[2])
-
-
-
-# function will handle extract process
-def extract(embedded_img, img_psize=8, t=10, b=10, key=3994, mode='embedding_mode'):
-    c, h, w = embedded_img.shape
-    img_h, img_w = h, w
-    embedded_img = embedded_img.reshape(c, h*w)
-
-    # extract dct
-    embedded_img_dct = np.apply_along_axis(new_utils.forwardProcess, 1, embedded_img, shape=(h, w))
-
-    # Calculate auto mark size
-    mark_w = embedded_img_dct.shape[2]
-    mark_h = embedded_img_dct.shape[1]
-
-    c, h, w, d, _ = embedded_img_dct.shape
-    embedded_img_dct = embedded_img_dct.reshape(c, h*w, d*d)
-
-    # extracting
-    extracted_mark = embedded_img_dct[:, :, b]
-    extracted_mark = np.float32(np.where(extracted_mark < 0, -1, 1))
-
-    t = int(t)
-    # in embedding mode we need to get all possible T values
-    # to test best reversed image
-    T = np.arange(t, 10, -10)
-    # however in extracting mode we need 1 T value provided by extracting code by user
-    if mode == 'extracting_mode':
-        T = np.array([float(t)])    
-
-    # get the right shape to perform operation correctly
-    T = np.float32(np.repeat(T, len(extracted_mark[0])).reshape(T.shape[0], len(extracted_mark[0])))
-    extracted_mark *= T
-
-    # reverse to original state
-    embedded_img_dct[:, :, b] -= extracted_mark
-    
-    # reconstruct extracted watermark and extracted original image
-    extracted_mark /= T
-    extracted_mark[extracted_mark == -1] = 0
-    extracted_mark = extracted_mark.reshape(T.shape[0], mark_h * mark_w)
-    extracted_mark = extracted_mark.astype('uint8')
-    extracted_mark = np.apply_along_axis(new_utils.image_scramble, 1, extracted_mark, key=key, shape=(mark_h, mark_w))
-    extracted_mark = extracted_mark * 255
-    extracted_mark = extracted_mark.reshape(T.shape[0], mark_h, mark_w)
-    extracted_mark = extracted_mark.astype('uint8')
-
-    embedded_img_dct = embedded_img_dct.reshape(c, h*w*d*d)
-    extracted_original = np.apply_along_axis(new_utils.backwardProcess, 1, embedded_img_dct, shape=(h, w))
-    extracted_original = extracted_original[:, :img_h, :img_w]
-
-    return extracted_original.reshape(extracted_original.shape[0], extracted_original.shape[1]*extracted_original.shape[2]), extracted_mark.reshape(c, mark_h, mark_w)
\ No newline at end of file
+import numpy as np
+import new_utils
+import scoring
+from workspace import workspace_buffer
+
+
+# T values to test, from t down to 10 by steps of 10 unless some values are given
+def get_t_values(t, t_values=None):
+    if t_values is not None:
+        return np.asarray(t_values)
+    return np.arange(int(t), 10, -10)
+
+
+# generator of the watermarked images of every T value, one (T, image) at a time
+# only one float image is used to build all of them, nothing is kept between two images
+# with a workspace (see workspace.Workspace) every array is one of its buffers, the image yielded included,
+# so it is overwritten by the next one
+def embedded_images(img, img_dct, normalized_mark, img_psize=8, t=10, b=10, t_values=None, workspace=None):
+    h, w, d, _= img_dct.shape
+    img_h, img_w = img.shape[:2]
+
+    # array of possible T values to test
+    T = get_t_values(t, t_values)
+
+    # pixels of the image (not rounded) recovered once from its dct
+    padded = new_utils.dct_pixels(img_dct, workspace_buffer(workspace, 'pixels', (h * d, w * d), img_dct.dtype),
+                                  workspace_buffer(workspace, 'pixel blocks', img_dct.shape, img_dct.dtype))
+    pixels = padded[:img_h, :img_w]
+
+    # basis pattern of coefficient b, with the sign of the watermark bit of every block
+    pattern = new_utils.coefficient_pattern(normalized_mark.reshape(h, w), b, d, workspace_buffer(workspace, 'pattern', (h * d, w * d)),
+                                            workspace_buffer(workspace, 'pattern blocks', img_dct.shape))[:img_h, :img_w]
+
+    candidate = np.empty((img_h, img_w)) if workspace is None else workspace.buffer('candidate', (img_h, img_w))
+    for i in range(T.shape[0]):
+        np.multiply(pattern, T[i], out=candidate)
+        candidate += pixels
+        embedded = new_utils.round_pixels(candidate, workspace_buffer(workspace, 'embedded', (img_h, img_w), np.uint8))
+
+        # ties are rounded like the old process did, every block has them (the pixels of the dct are integers)
+        if new_utils.tie_pixels(T[i], b, d).any():
+            blocks = new_utils.fftpack_blocks(new_utils.extract_patches(np.round(padded), d), normalized_mark.reshape(h, w) * T[i], b)
+            embedded[...] = new_utils.fusion_patches(blocks)[:img_h, :img_w]
+
+        yield T[i], embedded
+
+
+# generator extracting images one at a time from (T, image) pairs, yields (T, image, original, watermark)
+# the same float image is used for every image to reverse them
+# row is the row of blocks where the images start when they are bands of a bigger image
+def extracted_images(images, img_psize=8, b=10, key=3994, row=0):
+    candidate = None
+    for T, image in images:
+        # extracting
+        extracted_mark = new_utils.coefficient_signs(new_utils.coefficient_values(image, b, img_psize), new_utils.extract_patches(image, img_psize), b)
+
+        # reverse to original state
+        if candidate is None:
+            candidate = np.empty(image.shape)
+        pattern = new_utils.coefficient_pattern(extracted_mark, b, img_psize)[:image.shape[0], :image.shape[1]]
+        np.multiply(pattern, -T, out=candidate)
+        candidate += image
+        extracted_original = new_utils.round_pixels(candidate)
+        # ties are rounded like the old process did, every block has them
+        if new_utils.tie_pixels(T, b, img_psize).any():
+            blocks = new_utils.fftpack_blocks(new_utils.extract_patches(image, img_psize), extracted_mark * -T, b)
+            extracted_original[...] = new_utils.fusion_patches(blocks)[:image.shape[0], :image.shape[1]]
+
+        # reconstruct extracted watermark
+        extracted_mark[extracted_mark == -1] = 0
+        extracted_mark = new_utils.image_scramble(extracted_mark.astype('uint8'), key, row=row) * 255
+
+        yield T, image, extracted_original, extracted_mark.astype('uint8')
+
+
+# extract a watermarked channel and check which blocks are recovered exactly, without recovering the whole channel
+# a block gives its original pixels back when its bit is read like it was embedded, none of its pixels was clipped
+# and no pixel was rounded from a tie (T times the basis pattern ending in exactly .5, see new_utils.tie_pixels),
+# only the blocks where one of those can happen are recovered and compared to the original channel, like extracted_images does
+# returns recovered channel, extracted watermark and the blocks that are not recovered exactly
+# row is the row of blocks where the channel starts when it is a band of a bigger channel
+# with a workspace the recovered channel is one of its buffers
+def verify_blocks(channel, mask, watermarked, normalized_mark, T, b, key, img_psize=8, row=0, workspace=None):
+    h, w = channel.shape
+    p = img_psize
+    mask = np.asarray(mask, dtype=np.uint8)
+    tile = new_utils.dct_basis(p)[b].reshape(p, p)
+
+    # bits read from the watermarked channel
+    extracted_mark = new_utils.coefficient_signs(new_utils.coefficient_values(watermarked, b, p), new_utils.extract_patches(watermarked, p), b)
+    bh, bw = extracted_mark.shape
+
+    # blocks read wrong and blocks that can be clipped, from the extremes of the masked blocks
+    minimums, maximums = new_utils.block_extremes(np.bitwise_xor(channel, mask, out=workspace_buffer(workspace, 'masked', channel.shape, np.uint8)), p)
+    amplitude = T * np.abs(tile).max()
+    checked = (extracted_mark != normalized_mark.reshape(bh, bw)) | (maximums + amplitude > 255.5 - 1e-6) | (minimums - amplitude < -0.5 + 1e-6)
+    ties = new_utils.tie_pixels(T, b, p).any()
+    if ties:
+        checked[:] = True
+
+    # only the checked blocks are recovered, the other ones are the original blocks
+    blocks = new_utils.extract_patches(channel, p)
+    if workspace is None:
+        blocks = np.ascontiguousarray(blocks)
+    else:
+        blocks = workspace.buffer('verified blocks', blocks.shape, np.uint8)
+        blocks[...] = new_utils.extract_patches(channel, p)
+    failed = np.zeros((bh, bw), dtype=bool)
+    if checked.any():
+        watermarked_blocks = new_utils.extract_patches(watermarked, p)[checked]
+        if ties:
+            recovered = new_utils.fftpack_blocks(watermarked_blocks, extracted_mark[checked] * -T, b) ^ mask
+        else:
+            recovered = new_utils.round_pixels(extracted_mark[checked].reshape(-1, 1, 1) * tile * -T + watermarked_blocks) ^ mask
+        inside = np.zeros((bh * p, bw * p), dtype=bool)
+        inside[:h, :w] = True
+        failed[checked] = ((recovered != blocks[checked]) & new_utils.extract_patches(inside, p)[checked]).any(axis=(1, 2))
+        blocks[checked] = recovered
+
+    # reconstruct extracted watermark
+    extracted_mark[extracted_mark == -1] = 0
+    extracted_mark = new_utils.image_scramble(extracted_mark.astype('uint8'), key, row=row) * 255
+
+    return new_utils.fusion_patches(blocks, out=workspace_buffer(workspace, 'verified', (bh * p, bw * p), np.uint8))[:h, :w], extracted_mark.astype('uint8'), failed
+
+
+# pixels of one channel and mask grouped to get the errors of T values at coefficient b without building any image
+# a watermarked pixel only depends on its masked value m, the pattern value v of its position and T,
+# it is round(m + T*v), and it is recovered as round(round(m + T*v) -/+ T*v) when the bit of its block
+# is read right/flipped, so pixels are grouped by (v, m, mask) and every T only needs a table of
+# the groups, the bit of a block is only calculated when its coefficient is close to -T or when
+# the block can be clipped (blocks on the border are built and extracted like extracted_images does)
+# T values with ties (see new_utils.tie_pixels) are rounded from the noise of the old process in every block,
+# all blocks are built and extracted with it then
+# everything that does not depend on T is prepared once, errors and bounds are then asked for every T value
+class PixelGroups:
+
+    def __init__(self, channel, channel_dct, mask, normalized_mark, b, img_psize=8):
+        h, w = channel.shape
+        bh, bw = channel_dct.shape[:2]
+        p = img_psize
+        self.shape, self.b, self.p = (h, w), b, p
+        self.signs = signs = normalized_mark.reshape(bh, bw)
+        self.tile = tile = new_utils.dct_basis(p)[b].reshape(p, p)
+
+        # the same floats as embedded_images, in blocks padded like extracted_images pads the watermarked images
+        # a single mask value is only broadcast to the blocks
+        mask = np.asarray(mask, dtype=np.uint8)
+        self.pixels = new_utils.extract_patches(new_utils.dct_pixels(channel_dct)[:h, :w], p)
+        self.pattern = new_utils.extract_patches(new_utils.coefficient_pattern(signs, b, p)[:h, :w], p)
+        self.masked = masked = new_utils.extract_patches(channel ^ mask, p)
+        self.original = new_utils.extract_patches(channel, p)
+        self.mask_blocks = mask_blocks = new_utils.mask_patches(mask, (h, w), p)
+        inside = np.zeros((bh * p, bw * p), dtype=bool)
+        inside[:h, :w] = True
+        self.inside = inside = new_utils.extract_patches(inside, p)
+        self.border = ~inside.all(axis=(2, 3))
+
+        # groups of pixels with the same pattern value, masked value and mask, padded pixels go in the last
+        # group which has no error
+        values, classes = np.unique(np.concatenate((-tile.reshape(-1), tile.reshape(-1))), return_inverse=True)
+        classes = classes.reshape(2, p, p)[(signs > 0).astype(int)]
+        mask_values = np.flatnonzero(np.bincount(mask.reshape(-1), minlength=256))
+        mask_ids = np.zeros(256, dtype=np.int64)
+        mask_ids[mask_values] = np.arange(mask_values.shape[0])
+        keys = (classes * 256 + masked) * mask_values.shape[0]
+        # with a single mask value every id is 0
+        if mask_values.shape[0] > 1:
+            keys += mask_ids[mask_blocks]
+        counts = np.bincount(keys[inside], minlength=values.shape[0] * 256 * mask_values.shape[0])
+        groups = np.flatnonzero(counts)
+        lookup = np.full(counts.shape[0], groups.shape[0])
+        lookup[groups] = np.arange(groups.shape[0])
+        self.group_ids = np.where(inside, lookup[keys], groups.shape[0]).reshape(bh, bw, p * p)
+        self.counts = np.append(counts[groups], 0)
+        self.group_values = values[groups // mask_values.shape[0] // 256]
+        self.group_masked = groups // mask_values.shape[0] % 256
+        self.group_mask = mask_values[groups % mask_values.shape[0]]
+        self.group_original = self.group_masked ^ self.group_mask
+
+        # the bit of a block is sure when its coefficient is far enough from -T, rounding moves it at most
+        # by half the sum of the pattern and clipping can only move it toward a flip
+        coefficients = channel_dct.reshape(bh, bw, p * p)[:, :, b]
+        if channel_dct.dtype != np.float64:
+            # float32 coefficients are too far from the exact ones to tell the sure blocks, they come from the pixels
+            coefficients = np.einsum('abij,ij->ab', self.pixels, tile)
+        self.coefficients = signs * coefficients
+        self.margin = np.abs(tile).sum() / 2 + 1e-6
+        # a block can be clipped from the smallest T that takes one of its pixels to 0 or 255
+        with np.errstate(divide='ignore', invalid='ignore'):
+            clip_t = np.where(signs.reshape(bh, bw, 1, 1) * tile > 0, 255 - masked, masked) / np.abs(tile)
+        self.clip_t = np.fmin.reduce(clip_t.reshape(bh, bw, p * p), axis=2)
+
+
+    # watermarked value of every group, groups where the noise of the pixels (some 1e-13) could change the rounding
+    # and the squared errors of every group watermarked, recovered and recovered from a flipped bit
+    # (one more group with no error is added for the padded pixels), for one T value or one row per T value
+    def tables(self, t):
+        t = np.asarray(t)[..., None]
+        group_embedded = self.group_values * t + self.group_masked
+        unsure = new_utils.round_pixels(group_embedded - 1e-9) != new_utils.round_pixels(group_embedded + 1e-9)
+        group_embedded = new_utils.round_pixels(group_embedded)
+        group_kept = new_utils.round_pixels(self.group_values * -t + group_embedded) ^ self.group_mask
+        group_flipped = new_utils.round_pixels(self.group_values * t + group_embedded) ^ self.group_mask
+        padding = np.zeros(t.shape[:-1] + (1,), dtype=np.int64)
+        embedded_errors = np.concatenate(((group_embedded.astype(np.int64) - self.group_original) ** 2, padding), axis=-1)
+        kept_errors = np.concatenate(((group_kept.astype(np.int64) - self.group_original) ** 2, padding), axis=-1)
+        flipped_errors = np.concatenate(((group_flipped.astype(np.int64) - self.group_original) ** 2, padding), axis=-1)
+        return group_embedded, unsure, embedded_errors, kept_errors, flipped_errors
+
+
+    # [sum of squared errors of the watermarked image, of the recovered image, flipped bits] of a T value
+    def errors(self, t):
+        b, p, signs, tile, group_ids, counts = self.b, self.p, self.signs, self.tile, self.group_ids, self.counts
+        group_embedded, unsure, embedded_errors, kept_errors, flipped_errors = self.tables(t)
+
+        # groups where the noise could change the rounding are built from the pixels (never seen, pixels are snapped
+        # before rounding)
+        exact = self.border.copy()
+        ties = new_utils.tie_pixels(t, b, p).any()
+        if ties:
+            exact[:] = True
+        elif unsure.any():
+            exact |= np.append(unsure, False)[group_ids].any(axis=2)
+        flipped = (self.coefficients + t < -self.margin) & ~exact
+        check = ~(flipped | exact | ((self.coefficients + t > self.margin) & (t < self.clip_t)))
+
+        # coefficient b of the blocks that are not sure, too close to 0 they are built like the others
+        coefficient = np.append(group_embedded, 0)[group_ids[check]] @ tile.reshape(-1)
+        exact[check] = np.abs(coefficient) < 1e-6
+        flipped[check] = (coefficient < 0) != (signs[check] < 0)
+        flipped &= ~exact
+
+        changed = group_ids[flipped | exact]
+        imper_sse = (counts * embedded_errors).sum() - embedded_errors[group_ids[exact]].sum()
+        recovered_sse = (counts * kept_errors).sum() - kept_errors[changed].sum() + flipped_errors[group_ids[flipped]].sum()
+        flips = flipped.sum()
+
+        # the other blocks are watermarked and extracted like the images
+        if ties:
+            embedded = new_utils.fusion_patches(new_utils.fftpack_blocks(self.masked, signs * t, b))[:self.shape[0], :self.shape[1]]
+            embedded = np.ascontiguousarray(new_utils.extract_patches(embedded, p)[exact])
+        else:
+            embedded = new_utils.round_pixels(self.pattern[exact] * t + self.pixels[exact])
+        extracted = new_utils.coefficient_signs(np.einsum('abij,ij->ab', embedded[None], tile)[0], embedded, b)
+        if ties:
+            recovered = new_utils.fftpack_blocks(embedded, extracted * -t, b) ^ self.mask_blocks[exact]
+        else:
+            recovered = new_utils.round_pixels(extracted.reshape(-1, 1, 1) * tile * -t + embedded) ^ self.mask_blocks[exact]
+        errors = self.inside[exact] * (embedded - self.original[exact].astype(np.int64)) ** 2
+        imper_sse += errors.sum()
+        errors = self.inside[exact] * (recovered - self.original[exact].astype(np.int64)) ** 2
+        recovered_sse += errors.sum()
+        flips += (extracted != signs[exact]).sum()
+
+        return [imper_sse, recovered_sse, flips]
+
+
+    # what the errors of every T value are at least, without looking at the bits of the blocks: the error of
+    # the watermarked image (exact), the error of the recovered image and the blocks whose bit surely flips
+    # blocks that surely keep or flip their bit are recovered like their groups (see errors), the other ones
+    # are at best recovered like the best of both (min), so with F and K the flipped and kept errors, the
+    # recovered error is at least flipped.F + kept.K + others.min = flipped.(F - min) + (kept - clipped).(K - min) + all.min
+    # where the blocks not flipped, kept and clipped only grow with T (see grown_sums), blocks on the border are never sure
+    # None for T values with ties or unsure groups (only errors tells them)
+    def bounds(self, t_values):
+        t_values = np.asarray(t_values)
+        _, unsure, embedded_errors, kept_errors, flipped_errors = self.tables(t_values)
+        best_errors = np.minimum(kept_errors, flipped_errors)
+        ordered, order = np.sort(t_values), np.argsort(t_values)
+        flipped_gain, kept_gain = (flipped_errors - best_errors)[order], (kept_errors - best_errors)[order]
+
+        # blocks from the biggest coefficient, the smallest T value from which they are not flipped and kept
+        blocks = np.flatnonzero(~self.border)
+        blocks = blocks[np.argsort(-self.coefficients.reshape(-1)[blocks], kind='stable')]
+        group_ids = self.group_ids.reshape(self.border.size, -1)[blocks]
+        coefficients = self.coefficients.reshape(-1)[blocks]
+        not_flipped = np.searchsorted(ordered, -coefficients - self.margin, side='left')
+        kept = np.searchsorted(ordered, self.margin - coefficients, side='right')
+        # blocks that can clip, from the smallest T value from which they are clipped
+        clipped = np.maximum(kept, np.searchsorted(ordered, self.clip_t.reshape(-1)[blocks], side='left'))
+        clippable = np.argsort(clipped, kind='stable')[:np.count_nonzero(clipped < len(t_values))]
+
+        inside = np.bincount(group_ids.reshape(-1), minlength=self.counts.shape[0])
+        recovered_sse = (flipped_gain @ inside) - self.grown_sums(group_ids, not_flipped, flipped_gain) \
+                        + self.grown_sums(group_ids, kept, kept_gain) - self.grown_sums(group_ids[clippable], clipped[clippable], kept_gain) \
+                        + best_errors[order] @ self.counts
+        flips = blocks.shape[0] - np.searchsorted(not_flipped, np.arange(len(t_values)), side='right')
+
+        index = np.searchsorted(ordered, t_values)
+        ties = new_utils.tie_pixels(t_values.reshape(-1, 1, 1), self.b, self.p).any(axis=(1, 2))
+        return [None if unsure[i].any() or ties[i] else [embedded_errors[i] @ self.counts, recovered_sse[index[i]], flips[index[i]]]
+                for i in range(len(t_values))]
+
+
+    # for every T value k (in order), the pixels of the blocks in a set that only grows with T, times errors[k]
+    # the blocks are given by their group ids and the index of the T value they join the set from, in order
+    def grown_sums(self, group_ids, joins, errors):
+        ends = np.searchsorted(joins, np.arange(len(errors)), side='right')
+        counts, start, sums = np.zeros(self.counts.shape[0], dtype=np.int64), 0, np.zeros(len(errors), dtype=np.int64)
+        for k, end in enumerate(ends):
+            counts += np.bincount(group_ids[start:end].reshape(-1), minlength=counts.shape[0])
+            start = end
+            sums[k] = counts @ errors[k]
+        return sums
+
+
+# the exact errors of every T value (see PixelGroups), same as building and extracting the images but without building them
+# returns [sum of squared errors of the watermarked image, of the recovered image, flipped bits] of every T value,
+# these sums can be added over parts of an image (bands of whole blocks)
+# it is still linear in the number of T values, every T value costs a table and a pass over the groups of the blocks,
+# what is saved is a constant factor (no image is built, rounded or compared)
+def t_value_errors(channel, channel_dct, mask, normalized_mark, t_values, b, img_psize=8):
+    groups = PixelGroups(channel, channel_dct, mask, normalized_mark, b, img_psize)
+    return [groups.errors(t) for t in np.asarray(t_values)]
+
+
+# psnrs (watermarked, recovered, watermark) from the [imper sse, recovered sse, flipped bits] of t_value_errors
+# size is the number of values of the image (all channels) and blocks the number of bits of the watermark
+def errors_psnrs(errors, size, blocks):
+    return [[new_utils.psnr_from_sse(imper_sse, size), new_utils.psnr_from_sse(recovered_sse, size), new_utils.psnr_from_sse(flips * 65025, blocks)]
+            for imper_sse, recovered_sse, flips in errors]
+
+
+# blocks of one channel and mask that can clip with the smallest T value of get_t_values(t)
+# found from the extremes of every block and the biggest value of the basis pattern of b, no dct is needed
+# returns a (blocks height, blocks width) array, None when no T value is left
+def risky_blocks(channel, mask, t, b, img_psize=8):
+    T = get_t_values(t)
+    if T.shape[0] == 0:
+        return None
+
+    minimums, maximums = new_utils.block_extremes(channel ^ np.asarray(mask, dtype=np.uint8), img_psize)
+    amplitude = T.min() * np.abs(new_utils.dct_basis(img_psize)[b]).max()
+    return (maximums + amplitude > 255.5) | (minimums - amplitude < -0.5)
+
+
+# pixels of one channel and mask that are recovered wrong whatever T value of get_t_values(t) is used
+# a masked pixel m with 0 < m < 255 watermarked out of [-0.5, 255.5] is clipped to 0/255, and it is recovered wrong
+# if the bit of its block is read right (T is removed from the clipped pixel) or flipped (T is added again)
+# the smallest T clips the fewest pixels, so the recovered image has at least this many wrong pixels
+# only the risky blocks are looked at
+def clipped_pixels(channel, mask, normalized_mark, t, b, img_psize=8):
+    risky = risky_blocks(channel, mask, t, b, img_psize)
+    if risky is None or not risky.any():
+        return 0
+
+    h, w = channel.shape
+    p = img_psize
+    bh, bw = risky.shape
+    masked = new_utils.extract_patches(channel ^ np.asarray(mask, dtype=np.uint8), p)
+    tile = new_utils.dct_basis(p)[b].reshape(p, p)
+
+    # pixels of the risky blocks watermarked with the smallest T, pixels added by padding are not counted
+    blocks = masked[risky].astype(float)
+    watermarked = blocks + get_t_values(t).min() * normalized_mark.reshape(bh, bw)[risky].reshape(-1, 1, 1) * tile
+    inside = np.zeros((bh * p, bw * p), dtype=bool)
+    inside[:h, :w] = True
+    inside = new_utils.extract_patches(inside, p)[risky]
+    wrong = ((watermarked > 255.5 + 1e-6) & (blocks < 255)) | ((watermarked < -0.5 - 1e-6) & (blocks > 0))
+
+    return int((wrong & inside).sum())
+
+
+# highest score every T value can get (the same score as best_psnr_different_t), from the bounds of its errors
+# (see PixelGroups.bounds): its watermarked image is known, its recovered image and its watermark are at best
+# the ones of the bounds, psnr scores only grow with the psnr, but for one point at every tie of round,
+# hence the extra multiplier per threshold
+# T values without bounds, or all of them when a multiplier is negative, can get any score (inf)
+def predicted_scores(groups, t_values, mask_name, multipliers, size):
+    scores = np.full(len(t_values), np.inf)
+    if min(multipliers['imper'], multipliers['recovered'], multipliers['mark']) < 0:
+        return scores
+
+    bounds = groups.bounds(t_values)
+    known = np.array([bound is not None for bound in bounds])
+    if known.any():
+        psnrs = np.array(errors_psnrs([bound for bound in bounds if bound is not None], size, groups.signs.size))
+        scores[known] = scoring.candidate_scores(psnrs[:, 0], psnrs[:, 1], psnrs[:, 2], mask_name, multipliers) \
+                        + len(scoring.psnr_thresholds) * multipliers['recovered']
+    return scores
+
+
+# smallest number of T values whose scores are predicted, the bounds of fewer T values cost about as much as
+# the exact errors they save (the groups are prepared for both) so they are all verified
+predicted_t_values = 30
+
+
+# choose the T value scoring.best_index would choose from the exact psnrs of every T value, but only the ones
+# that can be chosen are verified: T values are verified from the best predicted score down (see predicted_scores)
+# until no predicted score left can beat the best exact score (or equal it with a smaller index)
+# returns the index of the chosen T value and its psnrs, and the number of T values verified
+def best_t_value(channel, channel_dct, mask, mask_name, normalized_mark, t_values, b, multipliers, img_psize=8, depth=3):
+    groups = PixelGroups(channel, channel_dct, mask, normalized_mark, b, img_psize)
+    size, blocks = channel.size * depth, groups.signs.size
+    if len(t_values) < predicted_t_values:
+        psnrs = np.array(errors_psnrs([groups.errors(t) for t in np.asarray(t_values)], size, blocks))
+        best = scoring.best_index(scoring.candidate_scores(psnrs[:, 0], psnrs[:, 1], psnrs[:, 2], mask_name, multipliers))
+        return best, psnrs[best].tolist(), len(t_values)
+
+    predicted = predicted_scores(groups, t_values, mask_name, multipliers, size)
+
+    psnrs, best, best_score = {}, None, None
+    for i in np.lexsort((np.arange(len(t_values)), -predicted)):
+        if best is not None and (predicted[i] < best_score or (predicted[i] == best_score and i > best)):
+            break
+        psnrs[i] = errors_psnrs([groups.errors(t_values[i])], size, blocks)[0]
+        score = scoring.candidate_scores(*psnrs[i], mask_name, multipliers).item()
+        if best is None or score > best_score or (score == best_score and i < best):
+            best, best_score = i, score
+
+    # the first T value is used if no score is above 0
+    if best_score <= 0:
+        best = 0
+        if best not in psnrs:
+            psnrs[best] = errors_psnrs([groups.errors(t_values[best])], size, blocks)[0]
+
+    return best, psnrs[best], len(psnrs)
+
+
+# score every T value of one channel and mask at coefficient b and keep the best one
+# same scores as best_psnr_different_t in the GUI, but only the embedded channel is used since
+# the other channels of the rgb image don't change (depth is the number of channels of the image)
+# the exact psnrs are only calculated for the T values that can be chosen (see best_t_value)
+# returns [T, psnr watermarked, psnr recovered, psnr watermark, score of this channel and mask]
+def evaluate_t_values(channel, channel_dct, mask, mask_name, normalized_mark, compare_mark, t, b, key, multipliers, depth=3):
+    T = get_t_values(t)
+    chosen, (psnr1, psnr2, psnr3), _ = best_t_value(channel, channel_dct, mask, mask_name, normalized_mark, T, b, multipliers, depth=depth)
+    T = T[chosen]
+
+    # score used to choose between channels and masks
+    score = scoring.candidate_scores(psnr1, psnr2, None, mask_name, multipliers).item()
+
+    return [T, psnr1, psnr2, psnr3, score]
+
+
+# (channel, mask_name) of every channel and mask to evaluate
+# all channels are tested with mask0, other masks are only tested on the red channel
+def channel_mask_jobs(masks):
+    return [(channel_name, _id) for _id in masks for channel_name in (('r', 'g', 'b') if _id == 'mask0' else ('r',))]
+
+
+# choose channel and mask from the scores of every (channel, mask_name) like the GUI does
+# all channels are tested with mask0, other masks are only tested on the red channel
+# mask0 is looked at first wherever it is in masks (the order of masks is the one of the codes, it is kept),
+# other masks must beat it
+def choose_channel_and_mask(scores, masks):
+    chosen_mask = 'mask0'
+    chosen_channel = 'r'
+    overall_score = 0
+
+    for _id in sorted(masks, key=lambda _id: _id != 'mask0'):
+        if _id == 'mask0':
+            chosen_mask = _id
+            maximum = max(scores[('r', _id)], scores[('b', _id)], scores[('g', _id)])
+
+            if maximum == scores[('r', _id)]:
+                chosen_channel = 'r'
+            elif maximum == scores[('b', _id)]:
+                chosen_channel = 'b'
+            else:
+                chosen_channel = 'g'
+
+            overall_score = maximum
+        elif scores[('r', _id)] > overall_score:
+            overall_score = scores[('r', _id)]
+            chosen_channel = 'r'
+            chosen_mask = _id
+
+    return chosen_channel, chosen_mask, overall_score
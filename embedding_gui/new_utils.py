@@ -1,229 +1,436 @@
-import cv2
-import numpy as np
-from math import ceil, log10
-import scipy.fftpack as fft
-
-
-def extract_patches(img, patch_size):
-    h, w = img.shape[:2]
-
-    # calculate new hight and width to pad the image
-    nh, nw = ceil(h / patch_size) * patch_size, ceil(w / patch_size) * patch_size
-
-    # pad image to make it devisible by the patch size
-    # just a note for the future maybe it will be useful
-    # we can re-destribute the new rows and columns in a way that we add half of the new rows in top and the other half in bottom
-    # same thing for columns half left, half right
-    img = cv2.copyMakeBorder(img, 0, nh-h, 0, nw-w, cv2.BORDER_REPLICATE)
-
-    # split the image into blocks
-    patches = np.array(np.hsplit(img, nw / patch_size))
-    patches = np.array(np.split(patches, nh / patch_size, axis=1))
-
-    return patches
-
-
-def fusion_patches(patches, axis=1):
-    patches = np.concatenate(patches, axis=1)
-    patches = np.concatenate(patches, axis=1)
-
-    return patches
-
-
-# dct function
-def dct(img, ax=2):
-    return fft.dct( fft.dct( img, type=2, norm='ortho', axis=ax ), axis=ax+1, norm='ortho', type=2 )
-
-
-#inverse dct
-def idct(dct_values, ax=2):
-    return fft.idct( fft.idct( dct_values, type=2, norm='ortho', axis=ax ), axis=ax+1, norm='ortho', type=2 )
-
-
-# calculate mse
-def mse(I1, I2):
-    N = 1
-    for x in I1.shape:
-        N *= x
-    return ((I1.astype(float) - I2.astype(float)) ** 2 ).sum() / (N)
-
-
-# calculate psnr
-def psnr(I1, I2):
-    if I1.shape != I2.shape:
-        return 0
-    
-    _mse = mse(I1, I2) + 0.000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000001
-    return 10 * log10(65025/_mse)
-
-
-# this function will split image into blocks and calculate dct of every block
-def forwardProcess(image, patch_size=8, shape=(0, 0)):
-    if shape[0] != 0 and shape[1] != 0:
-        image = image.reshape(shape[0], shape[1])
-    image = np.float64(image)
-    image = extract_patches(image, patch_size)
-    image = dct(image)
-    return image
-
-
-# this function will calculate inverse dct of every block and fusion them to make regular image
-def backwardProcess(image, patch_size=8, shape=(0, 0)):
-    if shape[0] != 0 and shape[1] != 0:
-        image = image.reshape(shape[0], shape[1], patch_size, patch_size)
-    image = idct(image)
-    image = np.round(fusion_patches(image))
-    image = np.clip(image, 0, 255)
-
-    return image.astype("uint8")
-
-
-# get pixmap to display image on UI
-def getPixmap(img):
-    from PyQt5.QtGui import QPixmap, QImage
-    # convert img to a good format
-    img = img.astype(np.uint8, order='C', casting='unsafe')
-    #if len(img.shape) == 3:
-        #img = cv2.cvtColor(img, cv2.COLOR_YCrCb2BGR)
-    # hyperparametres
-    height, width = img.shape[:2]
-    bytesPerLine = width
-    # assume that the image is a grayscaled image
-    image_format = QImage.Format_Grayscale8
-    
-    # if image is not grayscaled
-    if len(img.shape) == 3:
-        # change format to RGB
-        bytesPerLine *= 3
-        image_format = QImage.Format_RGB888
-
-    # create QImage
-    image = QImage(img.data, width, height, bytesPerLine, image_format)
-    image = image.rgbSwapped()
-
-    # get PIXMAP to display image on the UI
-    return QPixmap.fromImage(image)
-
-
-# function that crypte our image using a key for mersenne twister
-def image_scramble(image, key, shape=(0, 0)):
-    # set seed to mersenne twister
-    np.random.seed(key)
-    if shape[0] != 0 and shape[1] != 0:
-        image = image.reshape(shape[0], shape[1])
-
-    # get maximum dimenstion to not have any overflow
-    max_dimension = max(image.shape[:2])
-    min_dimension = min(image.shape[:2])
-    
-    # generate random set on number with lenght of 16
-    key_line = np.random.uniform(-1, 1, 16)
-    # repeat this set max_dimension times
-    key_line = np.repeat([key_line], max_dimension, axis=0).flatten()
-    # replace set 0s and 1s
-    key_line = np.where(key_line >= 0, 1, 0)
-
-    # apply XOR operation
-    image = image ^ key_line[:len(image[0])]
-    # calculate transpose of the image
-    image = image.T
-    # apply XOR operation
-    image = image ^ key_line[:len(image[0])]
-
-    return image.T
-
-# function to calculate absolute maximum of DCT coefficent across all blocks
-def maximum_dct_value(dct_values, b):
-    return np.round(np.abs( ( dct_values.reshape(dct_values.shape[0] * dct_values.shape[1], dct_values.shape[2]**2) )[:, b] ).max())
-
-# find value T based on a given DCT index
-def find_value_t(dct_values, t, index):
-    zigzag_indexes = [
-                        0,
-                        1, 8,
-                        16, 9, 2,
-                        3, 10, 17, 24,
-                        32, 25, 18, 11, 4,
-                        5, 12, 19, 26, 33, 40,
-                        48, 41, 34, 27, 20, 13, 6,
-                        7, 14, 21, 28, 35, 42, 49, 56,
-                        57, 50, 43, 36, 29, 22, 15,
-                        23, 30, 37, 44, 51, 58,
-                        59, 52, 45, 38, 31,
-                        39, 46, 53, 60,
-                        61, 54, 47,
-                        55, 62,
-                        63
-                     ]
-
-    index = zigzag_indexes[index]
-    maximum_value = maximum_dct_value(dct_values, index)
-    maximum_value = max(maximum_value, 11)
-    maximum_value += t
-    
-    return [index, maximum_value]
-
-
-# REST OF FUNCTION ARE TO EVALUATE PSNR
-def evaluate_psnr(psnr_value, multiplier):
-    score = 0
-
-    if psnr_value < 20:
-        score -= (20 * multiplier)
-
-    if psnr_value >= 20:
-        score += ((1 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
-    
-    if psnr_value >= 40:
-        score += ((2 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
-
-    if psnr_value >= 50:
-        score += ((3 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
-
-    if psnr_value >= 60:
-        score += ((4 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
-
-    if psnr_value >= 75:
-        score += ((5 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
-    
-    if psnr_value >= 90:
-        score += ((6 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
-
-    if psnr_value >= 100:
-        score += ((7 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
-
-    return score
-
-
-def evaluate_mask(mask_string, multiplier):
-    n = int(mask_string[4:])
-    score = 0
-
-    if n == 0:
-        score += (3 * multiplier)
-    
-    if n > 1:
-        score -= (1 * multiplier)
-    
-    if n >= 8:
-        score -= (2 * multiplier)
-
-    if n >= 16:
-        score -= (3 * multiplier)
-
-    return score
-
-
-def evaluate_psnr_mark(psnr_value, multiplier):
-    score = 0
-
-    if psnr_value < 5:
-        score -= (30 * multiplier)
-
-    if psnr_value < 8:
-        score -= (15 * multiplier)
-
-    if psnr_value < 10:
-        score -= (10 * multiplier)
-
+import numpy as np
+from functools import lru_cache
+from math import ceil
+import scipy.fftpack as fft
+import metrics
+
+
+# split the image into (patch_size x patch_size) blocks
+# the blocks are a reshaped view of the (padded) image, nothing is copied here
+def extract_patches(img, patch_size):
+    h, w = img.shape[:2]
+
+    # calculate new hight and width to pad the image
+    nh, nw = ceil(h / patch_size) * patch_size, ceil(w / patch_size) * patch_size
+
+    # pad image to make it devisible by the patch size
+    # just a note for the future maybe it will be useful
+    # we can re-destribute the new rows and columns in a way that we add half of the new rows in top and the other half in bottom
+    # same thing for columns half left, half right
+    # edge padding is the same as cv2.BORDER_REPLICATE but works with any dtype
+    if nh != h or nw != w:
+        img = np.pad(img, ((0, nh-h), (0, nw-w)) + ((0, 0),) * (img.ndim - 2), mode='edge')
+
+    # split the image into blocks
+    # patches[i, j] is the block img[i*patch_size:(i+1)*patch_size, j*patch_size:(j+1)*patch_size]
+    patches = img.reshape(nh // patch_size, patch_size, nw // patch_size, patch_size, *img.shape[2:])
+    patches = patches.swapaxes(1, 2)
+
+    return patches
+
+
+# put blocks back together into a regular image
+# reshape needs a copy here since blocks are not contiguous rows of the image
+# with out (a contiguous (h * ph, w * pw) array) the image is written in it instead of a new array
+def fusion_patches(patches, axis=1, out=None):
+    h, w, ph, pw = patches.shape[:4]
+    if out is not None:
+        out.reshape(h, ph, w, pw, *patches.shape[4:])[...] = patches.swapaxes(1, 2)
+        return out
+    patches = patches.swapaxes(1, 2).reshape(h * ph, w * pw, *patches.shape[4:])
+
+    return patches
+
+
+# orthonormal DCT-II bases already computed, one per block size
+dct_bases = {}
+
+# coefficients that are exactly 0 can come out of the matrix product as +/- rounding noise
+# anything smaller than this tolerance should be read as 0
+dct_zero_tolerance = 1e-9
+
+
+# the old dct (two scipy.fftpack passes) of some (n x n) blocks
+# the old version read the sign of a coefficient that is exactly 0 (and rounded a maximum that is exactly x.5)
+# from the rounding noise of this dct, so the few blocks where that happens are transformed with it again
+def fftpack_dct(blocks):
+    return fft.dct( fft.dct( blocks, type=2, norm='ortho', axis=-2 ), axis=-1, norm='ortho', type=2 )
+
+
+# the old inverse dct of some (n x n) blocks
+def fftpack_idct(coefficients):
+    return fft.idct( fft.idct( coefficients, type=2, norm='ortho', axis=-2 ), axis=-1, norm='ortho', type=2 )
+
+
+# bits read from the coefficients b of blocks (blocks has the shape of coefficients plus the block axes)
+# -1 where the coefficient is negative and 1 elsewhere, coefficients that are exactly 0 get the bit the old dct gave them
+def coefficient_signs(coefficients, blocks, b):
+    signs = np.where(coefficients < 0, -1, 1)
+    zero = np.abs(coefficients) < dct_zero_tolerance
+    if zero.any():
+        n = blocks.shape[-1]
+        signs[zero] = np.where(fftpack_dct(np.float64(blocks[zero]))[:, b // n, b % n] < 0, -1, 1)
+    return signs
+
+
+# get the basis of the 2D DCT of a (n x n) block as one (n*n x n*n) matrix
+# row u*n+v holds the pattern of coefficient (u, v) flattened, so the dct of
+# a flattened block is basis @ block and the inverse dct is basis.T @ coefficients
+def dct_basis(n=8):
+    if n not in dct_bases:
+        k = np.arange(n).reshape(n, 1)
+        i = np.arange(n).reshape(1, n)
+        # 1D DCT-II matrix
+        c = np.sqrt(2 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+        c[0, :] = np.sqrt(1 / n)
+        # C.X.Ct on a block is the same as kron(C, C) on the flattened block
+        dct_bases[n] = np.kron(c, c)
+    return dct_bases[n]
+
+
+# multiply every block of the patches array by the same matrix
+# all blocks are done at once with a single matrix product
+def blocks_product(patches, matrix, ax=2, out=None):
+    patches = np.moveaxis(patches, (ax, ax+1), (-2, -1))
+    shape = patches.shape
+    if out is not None:
+        # out is a contiguous array with the blocks on the last two axes, the same product is written in it
+        np.matmul(patches.reshape(-1, shape[-2] * shape[-1]), matrix, out=out.reshape(-1, shape[-2] * shape[-1]))
+        return out
+    result = (patches.reshape(-1, shape[-2] * shape[-1]) @ matrix).reshape(shape)
+    return np.moveaxis(result, (-2, -1), (ax, ax+1))
+
+
+# dct function, float32 blocks are transformed in float32
+def dct(img, ax=2, out=None):
+    return blocks_product(img, dct_basis(img.shape[ax]).T.astype(img.dtype if img.dtype == np.float32 else np.float64, copy=False), ax, out)
+
+
+#inverse dct
+def idct(dct_values, ax=2, out=None):
+    return blocks_product(dct_values, dct_basis(dct_values.shape[ax]), ax, out)
+
+
+# pixels (not rounded) of the blocks of a dct, like fusion_patches(idct(dct_values))
+# a float32 dct only gives them to about 1e-4, they are integers (dct of an image) so they are rounded back
+# out (the image) and blocks (the shape of the dct) are arrays of the type of the dct to write in, new ones when None
+def dct_pixels(dct_values, out=None, blocks=None):
+    pixels = fusion_patches(idct(dct_values, out=blocks), out=out)
+    if dct_values.dtype != np.float64:
+        np.round(pixels, out=pixels)
+    return pixels
+
+
+# calculate mse
+def mse(I1, I2):
+    return metrics.stack_mse([I1], I2)[0]
+
+
+# calculate psnr
+def psnr(I1, I2):
+    return float(metrics.stack_psnr([I1], I2)[0])
+
+
+# calculate psnr from the sum of squared errors of images of N values (all channels)
+# useful when only one channel is different, we don't need to build the full images
+def psnr_from_sse(sse, N):
+    return metrics.psnr_from_sse(sse, N)
+
+
+# largest error of a float32 dct coefficient, 64 products summing to at most 2040 with 24 bits floats
+float32_tolerance = 1e-2
+
+# rows of blocks transformed at once when the dct is written in a given array (see forwardProcess)
+dct_chunk_rows = 64
+
+
+# this function will split image into blocks and calculate dct of every block
+# with out (a memory mapped file for example) the dct is written in it a few rows of blocks at a time,
+# so no other array holds the whole dct, the values are the same
+# dtype is the type of the dct (np.float32 halves its size but only keeps about 7 digits), out gives it when set
+def forwardProcess(image, patch_size=8, shape=(0, 0), out=None, dtype=np.float64):
+    if shape[0] != 0 and shape[1] != 0:
+        image = image.reshape(shape[0], shape[1])
+    image = extract_patches(image, patch_size)
+    if out is not None:
+        for row in range(0, image.shape[0], dct_chunk_rows):
+            dct(np.ascontiguousarray(image[row:row + dct_chunk_rows], dtype=out.dtype), out=out[row:row + dct_chunk_rows])
+        return out
+    # the only copy of the image, contiguous so the dct can use the blocks directly
+    image = np.ascontiguousarray(image, dtype=dtype)
+    image = dct(image)
+    return image
+
+
+# pixels are snapped to a grid of 2**-19 (about 2e-6) before rounding, so pixels that are
+# exactly x.5 are rounded the same way whatever floating point noise the transform added
+# adding then removing 2**33 does it since a float64 only keeps 52 bits after the leading one
+# the old fftpack process rounded those ties up or down from its noise, so images with ties are built
+# again like it did (see tie_pixels and fftpack_blocks)
+pixel_snap = 2.0 ** 33
+
+
+# round and clip reconstructed pixels to get a regular image (works in place)
+# with out (an uint8 array of the same shape) the image is written in it instead of a new array
+def round_pixels(image, out=None):
+    image += pixel_snap
+    image -= pixel_snap
+    np.round(image, out=image)
+    np.clip(image, 0, 255, out=image)
+
+    if out is not None:
+        np.copyto(out, image, casting='unsafe')
+        return out
+    return image.astype("uint8")
+
+
+# positions of a (n x n) block where T times the basis pattern of b ends in exactly .5, the pixels there are ties
+# (b=0, 4, 32 and 36 have a pattern of +/-1/8 so every pixel is a tie when T=4 mod 8, the other patterns give none)
+def tie_pixels(T, b, n=8):
+    return np.abs(np.abs(T * dct_basis(n)[b].reshape(n, n)) % 1 - 0.5) < 1e-6
+
+
+# the old process on some blocks (integer pixels): fftpack dct, values added to coefficient b, fftpack inverse dct,
+# rounded and clipped, so the ties are rounded up or down like the noise of fftpack did
+# only needed for blocks with ties, the other pixels are the ones the matrix dct gives
+def fftpack_blocks(blocks, values, b):
+    n = blocks.shape[-1]
+    coefficients = fftpack_dct(np.float64(blocks))
+    coefficients[..., b // n, b % n] += values
+    return np.clip(np.round(fftpack_idct(coefficients)), 0, 255).astype(np.uint8)
+
+
+# this function will calculate inverse dct of every block and fusion them to make regular image
+def backwardProcess(image, patch_size=8, shape=(0, 0)):
+    if shape[0] != 0 and shape[1] != 0:
+        image = image.reshape(shape[0], shape[1], patch_size, patch_size)
+    image = idct(image)
+    image = fusion_patches(image)
+
+    return round_pixels(image)
+
+
+# calculate only coefficient b of the dct of every block, one dot product per block
+# with its basis pattern, the result has one value per block
+def coefficient_values(image, b, patch_size=8, shape=(0, 0)):
+    if shape[0] != 0 and shape[1] != 0:
+        image = image.reshape(shape[0], shape[1])
+    tile = dct_basis(patch_size)[b].reshape(patch_size, patch_size)
+    return np.einsum('abij,ij->ab', extract_patches(image, patch_size), tile)
+
+
+# pixels of the basis pattern of coefficient b in every block, weighted by one value per block
+# this is the inverse dct of blocks where only coefficient b is not 0
+# out (the image) and blocks (float64 blocks of the image) are arrays to write in, new ones when None
+def coefficient_pattern(values, b, patch_size=8, out=None, blocks=None):
+    tile = dct_basis(patch_size)[b].reshape(patch_size, patch_size)
+    return fusion_patches(np.multiply(values.reshape(values.shape[0], values.shape[1], 1, 1), tile, out=blocks), out=out)
+
+
+# minimum and maximum of every (patch_size x patch_size) block of an image, like extract_patches(...).min/max(axis=(2, 3))
+# rows of blocks then blocks are reduced, much faster than reducing the two small axes of the blocks at once
+def block_extremes(img, patch_size=8):
+    h, w = img.shape[:2]
+    nh, nw = ceil(h / patch_size) * patch_size, ceil(w / patch_size) * patch_size
+    if nh != h or nw != w:
+        img = np.pad(img, ((0, nh-h), (0, nw-w)), mode='edge')
+
+    rows = img.reshape(nh // patch_size, patch_size, nw)
+    minimums = rows.min(axis=1).reshape(nh // patch_size, nw // patch_size, patch_size).min(axis=2)
+    maximums = rows.max(axis=1).reshape(nh // patch_size, nw // patch_size, patch_size).max(axis=2)
+
+    return minimums, maximums
+
+
+# a mask is one xor value for the whole channel (or an array of values of the channel shape)
+# blocks of a mask like extract_patches gives them, a single value is only broadcast so no memory is used
+def mask_patches(mask, shape, patch_size=8):
+    mask = np.asarray(mask, dtype=np.uint8)
+    if mask.ndim == 0:
+        return np.broadcast_to(mask, (ceil(shape[0] / patch_size), ceil(shape[1] / patch_size), patch_size, patch_size))
+
+    return extract_patches(np.broadcast_to(mask, shape[:2]), patch_size)
+
+
+# get pixmap to display image on UI
+def getPixmap(img):
+    from PyQt5.QtGui import QPixmap, QImage
+    # convert img to a good format
+    img = img.astype(np.uint8, order='C', casting='unsafe')
+    #if len(img.shape) == 3:
+        #img = cv2.cvtColor(img, cv2.COLOR_YCrCb2BGR)
+    # hyperparametres
+    height, width = img.shape[:2]
+    bytesPerLine = width
+    # assume that the image is a grayscaled image
+    image_format = QImage.Format_Grayscale8
+    
+    # if image is not grayscaled
+    if len(img.shape) == 3:
+        # change format to RGB
+        bytesPerLine *= 3
+        image_format = QImage.Format_RGB888
+
+    # create QImage
+    image = QImage(img.data, width, height, bytesPerLine, image_format)
+    image = image.rgbSwapped()
+
+    # get PIXMAP to display image on the UI
+    return QPixmap.fromImage(image)
+
+
+# xor pattern of a key for images of this shape
+# a key line of 16 bits from a mersenne twister seeded with the key is repeated along the columns and along the rows
+# the generator belongs to this call, the global numpy one is not touched so it is safe with threads
+# cached since the same key and shape are used for every T value and every image of a batch
+# row is the row of the image where the pattern starts, to scramble bands of an image one at a time
+@lru_cache(maxsize=64)
+def scramble_pattern(key, shape, row=0):
+    # same numbers as np.random.seed(key) then np.random.uniform(-1, 1, 16)
+    key_line = np.random.RandomState(key).uniform(-1, 1, 16)
+    # replace set 0s and 1s
+    key_line = np.where(key_line >= 0, 1, 0)
+
+    # xor of the key line repeated along the rows and along the columns
+    pattern = np.resize(np.roll(key_line, -row), shape[0])[:, None] ^ np.resize(key_line, shape[1])[None, :]
+    pattern.flags.writeable = False
+    return pattern
+
+
+# function that crypte our image using a key for mersenne twister
+# applying it twice gives the image back
+# image can be a stack of images (..., height, width), all of them are scrambled with one xor
+# row is the row of the whole image where image starts when image is a band of it
+def image_scramble(image, key, shape=(0, 0), row=0):
+    if shape[0] != 0 and shape[1] != 0:
+        image = image.reshape(shape[0], shape[1])
+
+    return image ^ scramble_pattern(int(key), image.shape[-2:], int(row) % 16)
+
+# zigzag order of the coefficients of an 8x8 block
+zigzag_indexes = [
+                    0,
+                    1, 8,
+                    16, 9, 2,
+                    3, 10, 17, 24,
+                    32, 25, 18, 11, 4,
+                    5, 12, 19, 26, 33, 40,
+                    48, 41, 34, 27, 20, 13, 6,
+                    7, 14, 21, 28, 35, 42, 49, 56,
+                    57, 50, 43, 36, 29, 22, 15,
+                    23, 30, 37, 44, 51, 58,
+                    59, 52, 45, 38, 31,
+                    39, 46, 53, 60,
+                    61, 54, 47,
+                    55, 62,
+                    63
+                 ]
+
+# function to calculate absolute maximum of DCT coefficent across all blocks
+def maximum_dct_value(dct_values, b):
+    return np.round(np.abs( ( dct_values.reshape(dct_values.shape[0] * dct_values.shape[1], dct_values.shape[2]**2) )[:, b] ).max())
+
+# same as maximum_dct_value but for all coefficients at once in one pass
+# gives a table of 64 values (not zigzag ordered) to look up instead of scanning blocks again
+# rows of blocks are read a few at a time, so no copy of the whole dct is made
+# a maximum that is exactly x.5 was rounded by the noise of the old dct, it is calculated again with the old dct
+# from image (the image the dct comes from), so the table is the one the old version found
+# a float32 maximum is only known to float32_tolerance, so the ones close to x.5 are calculated again the same way
+def maximum_dct_values(dct_values, image=None):
+    maximums = np.zeros(dct_values.shape[2]**2)
+    for row in range(0, dct_values.shape[0], dct_chunk_rows):
+        chunk = dct_values[row:row + dct_chunk_rows]
+        np.maximum(maximums, np.abs( chunk.reshape(chunk.shape[0] * chunk.shape[1], chunk.shape[2]**2) ).max(axis=0), out=maximums)
+    if image is not None:
+        tolerance = dct_zero_tolerance if dct_values.dtype == np.float64 else float32_tolerance
+        values = dct_values.reshape(dct_values.shape[0] * dct_values.shape[1], dct_values.shape[2]**2)
+        for index in np.flatnonzero(np.abs(maximums % 1 - 0.5) < tolerance):
+            # only blocks close enough to the maximum can hold it
+            blocks = np.flatnonzero(np.abs(values[:, index]) >= maximums[index] - 2 * tolerance)
+            maximums[index] = np.abs(block_coefficients(image, blocks, index, dct_values.shape[2])).max()
+    return np.round(maximums)
+
+
+# coefficient index of some blocks (flat indexes) of an image, with the old dct (see fftpack_dct)
+def block_coefficients(image, blocks, index, patch_size=8):
+    patches = extract_patches(image, patch_size)
+    rows, cols = np.unravel_index(blocks, patches.shape[:2])
+    return fftpack_dct(np.float64(patches[rows, cols])).reshape(blocks.shape[0], patch_size**2)[:, index]
+
+# find value T based on a given DCT index
+# maximums is an optional table given by maximum_dct_values
+def find_value_t(dct_values, t, index, maximums=None):
+    index = zigzag_indexes[index]
+    if maximums is None:
+        maximum_value = maximum_dct_value(dct_values, index)
+    else:
+        maximum_value = maximums[index]
+    maximum_value = max(maximum_value, 11)
+    maximum_value += t
+    
+    return [index, maximum_value]
+
+
+# REST OF FUNCTION ARE TO EVALUATE PSNR
+def evaluate_psnr(psnr_value, multiplier):
+    score = 0
+
+    if psnr_value < 20:
+        score -= (20 * multiplier)
+
+    if psnr_value >= 20:
+        score += ((1 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
+    
+    if psnr_value >= 40:
+        score += ((2 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
+
+    if psnr_value >= 50:
+        score += ((3 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
+
+    if psnr_value >= 60:
+        score += ((4 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
+
+    if psnr_value >= 75:
+        score += ((5 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
+    
+    if psnr_value >= 90:
+        score += ((6 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
+
+    if psnr_value >= 100:
+        score += ((7 * multiplier) + (int(psnr_value - round(psnr_value / 10)) * multiplier) )
+
+    return score
+
+
+def evaluate_mask(mask_string, multiplier):
+    n = int(mask_string[4:])
+    score = 0
+
+    if n == 0:
+        score += (3 * multiplier)
+    
+    if n > 1:
+        score -= (1 * multiplier)
+    
+    if n >= 8:
+        score -= (2 * multiplier)
+
+    if n >= 16:
+        score -= (3 * multiplier)
+
+    return score
+
+
+def evaluate_psnr_mark(psnr_value, multiplier):
+    score = 0
+
+    if psnr_value < 5:
+        score -= (30 * multiplier)
+
+    if psnr_value < 8:
+        score -= (15 * multiplier)
+
+    if psnr_value < 10:
+        score -= (10 * multiplier)
+
     return score
\ No newline at end of file
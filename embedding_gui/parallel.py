@@ -0,0 +1,181 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import new_utils
+from new_algorithms import evaluate_t_values, choose_channel_and_mask, risky_blocks, clipped_pixels, channel_mask_jobs
+
+
+# data of the jobs in this process, set by attach_data (in the workers) or directly when running serially
+# arrays are the original channels ('r', 'g', 'b'), the dcts ((channel, mask_name)) and the masks that are arrays
+# masks that are a single value are given with the settings
+job_data = {}
+
+
+# copy arrays into shared memory blocks so the workers read them without getting a copy each
+# arrays mapped from a file (dcts of a store, see engine.calculate_dcts) are not copied, the workers map the file
+# returns the blocks (to free them later) and what the workers need to find them
+def share_arrays(arrays):
+    blocks, specs = [], {}
+    for name, array in arrays.items():
+        if isinstance(array, np.memmap) and array.filename is not None:
+            array.flush()
+            specs[name] = (array.filename, array.offset, array.shape, array.dtype.str)
+            continue
+
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        specs[name] = (block.name, None, array.shape, array.dtype.str)
+
+    return blocks, specs
+
+
+# pool initializer, the arrays are views on the shared blocks (the blocks are kept so they stay open)
+# or on the files they are mapped from (the source is a block name or a file name, offset is only given for files)
+def attach_data(specs, settings):
+    job_data['blocks'] = []
+    job_data['arrays'] = {}
+    for name, (source, offset, shape, dtype) in specs.items():
+        if offset is not None:
+            job_data['arrays'][name] = np.memmap(source, dtype=dtype, mode='r', offset=offset, shape=shape)
+            continue
+
+        block = shared_memory.SharedMemory(name=source)
+        job_data['blocks'].append(block)
+        job_data['arrays'][name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    job_data.update(settings)
+
+
+# evaluate the T values of one channel and mask (see evaluate_t_values)
+def t_value_job(channel_name, mask_name, b, t):
+    arrays = job_data['arrays']
+    mask = job_data['masks'][mask_name] if mask_name in job_data['masks'] else arrays[mask_name]
+    return evaluate_t_values(arrays[channel_name], arrays[(channel_name, mask_name)], mask, mask_name, job_data['normalized_mark'],
+                             job_data['compare_mark'], t, b, job_data['key'], job_data['multipliers'])
+
+
+# blocks of one channel and mask that can clip (see risky_blocks), or with count the pixels that are
+# recovered wrong with every T value (see clipped_pixels)
+def clipping_job(channel_name, mask_name, b, t, count=False):
+    arrays = job_data['arrays']
+    mask = job_data['masks'][mask_name] if mask_name in job_data['masks'] else arrays[mask_name]
+    if count:
+        return clipped_pixels(arrays[channel_name], mask, job_data['normalized_mark'], t, b)
+
+    risky = risky_blocks(arrays[channel_name], mask, t, b)
+    return 0 if risky is None else int(risky.sum())
+
+
+# score of one channel and mask at an embedding position
+def position_job(position, channel_name, mask_name, tvalue):
+    b, t = new_utils.find_value_t(None, tvalue, position, job_data['maximums'][(channel_name, mask_name)])
+    return t_value_job(channel_name, mask_name, b, t)[-1]
+
+
+# run the jobs of every channel and mask over a pool of processes
+# the channels and dcts are put in shared memory once, every job only gets names and numbers
+# with workers=1 the same jobs run one after another in this process
+# channels are the original channels by name ('r', 'g', 'b'), dcts[channel][mask_name] the dcts of the masked channels
+# maximums[channel][mask_name] the coefficient maximums, only needed to search positions
+class JobPool:
+
+    def __init__(self, channels, dcts, masks, normalized_mark, compare_mark, key, multipliers, maximums=None, workers=None):
+        self.masks = masks
+        self.multipliers = multipliers
+        self.workers = workers or os.cpu_count() or 1
+
+        # all channels are tested with mask0, other masks are only tested on the red channel
+        self.jobs = channel_mask_jobs(masks)
+
+        arrays = {}
+        for channel_name, _id in self.jobs:
+            arrays[channel_name] = np.asarray(channels[channel_name])
+            arrays[(channel_name, _id)] = dcts[channel_name][_id]
+            if np.ndim(masks[_id]):
+                arrays[_id] = np.asarray(masks[_id], dtype=np.uint8)
+        # number of values of the image (all channels)
+        self.size = arrays['r'].size * 3
+
+        settings = {'normalized_mark': normalized_mark, 'compare_mark': compare_mark, 'key': key, 'multipliers': multipliers,
+                    'masks': {_id: np.uint8(mask) for _id, mask in masks.items() if np.ndim(mask) == 0},
+                    'maximums': {(c, m): maximums[c][m] for c, m in self.jobs} if maximums is not None else None}
+
+        self.blocks = []
+        self.executor = None
+        if self.workers > 1:
+            self.blocks, specs = share_arrays(arrays)
+            self.executor = ProcessPoolExecutor(self.workers, initializer=attach_data, initargs=(specs, settings))
+        else:
+            job_data.clear()
+            job_data['arrays'] = arrays
+            job_data.update(settings)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    # stop the workers and free the shared memory
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+    # results of a job function for every arguments, in the same order
+    def map(self, function, *arguments):
+        if self.executor is None:
+            return list(map(function, *arguments))
+
+        return list(self.executor.map(function, *arguments))
+
+
+    # T value chosen for every channel and mask, t_s[channel][mask_name] are the [b, t] of find_value_t
+    # jobs are the (channel, mask_name) to evaluate, all of them by default
+    # returns {(channel, mask_name): [T, psnr watermarked, psnr recovered, psnr watermark, score]}
+    def t_values(self, t_s, jobs=None):
+        jobs = self.jobs if jobs is None else list(jobs)
+        if not jobs:
+            return {}
+        results = self.map(t_value_job, *zip(*[(c, m, t_s[c][m][0], t_s[c][m][1]) for c, m in jobs]))
+        return dict(zip(jobs, results))
+
+
+    # blocks that can clip for every channel and mask (see risky_blocks), or with count the pixels that are
+    # recovered wrong whatever T value is chosen (see clipped_pixels)
+    # returns {(channel, mask_name): number of blocks or pixels}
+    def clipping(self, t_s, count=False, jobs=None):
+        jobs = self.jobs if jobs is None else list(jobs)
+        if not jobs:
+            return {}
+        results = self.map(clipping_job, *zip(*[(c, m, t_s[c][m][0], t_s[c][m][1], count) for c, m in jobs]))
+        return dict(zip(jobs, results))
+
+
+    # evaluate embedding positions (indexes in zigzag order) for every channel and mask and find the best one,
+    # every position, channel and mask is a job, the dcts and maximums of the pool are used so nothing is transformed again
+    # returns the best position and its overall score
+    def search_position(self, tvalue=2, positions=range(1, 64)):
+        positions = list(positions)
+        jobs = [(position, c, m, tvalue) for position in positions for c, m in self.jobs]
+        results = iter(self.map(position_job, *zip(*jobs)))
+
+        best_position, best_score = None, 0
+        for position in positions:
+            scores = {job: next(results) for job in self.jobs}
+            overall_score = choose_channel_and_mask(scores, self.masks)[2]
+            if best_position is None or overall_score > best_score:
+                best_position, best_score = position, overall_score
+
+        return best_position, best_score
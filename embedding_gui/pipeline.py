@@ -0,0 +1,141 @@
+import numpy as np
+
+import engine
+from parallel import JobPool
+
+
+# the watermarking of the GUI as a graph of stages, every stage is only calculated again when one of its inputs changed:
+#   image -> dcts (masked dcts and the maximums of their coefficients) -> t_values (b and the range of T values)
+#   watermark, key -> mark (the watermark resized and scrambled)       -> embedding_position (searched when position is None)
+#   dcts, t_values, mark -> candidates (best T and scores of every channel and mask) -> chosen -> images -> code
+# so changing the key only scrambles the watermark again and evaluates the candidates again, and changing the
+# watermark never transforms the image again
+# values given with set are kept as they are, arrays must not be changed in place afterwards (set new ones)
+
+
+class Pipeline:
+
+    def __init__(self):
+        self.stages = {}
+        self.values = {}
+        # version of every value (the number of the change that gave it) and the versions of the inputs of every stage
+        # when it was last calculated
+        self.versions = {}
+        self.input_versions = {}
+        self.changes = 0
+        # number of times every stage was calculated
+        self.runs = {}
+
+
+    # add a stage, function is called with the values of inputs (set values or other stages) in that order
+    # with compare a new result equal to the last one is not a change, stages using it are not calculated again
+    # (only for small results, like a position)
+    def stage(self, name, inputs, function, compare=False):
+        self.stages[name] = (tuple(inputs), function, compare)
+        self.runs[name] = 0
+
+
+    # set input values, a value equal to the one already set (arrays compared by content) changes nothing
+    def set(self, **values):
+        for name, value in values.items():
+            if name in self.stages:
+                raise ValueError('%s is a stage, it can not be set' % name)
+            if name not in self.values or not same(self.values[name], value):
+                self.change(name, value)
+
+
+    def change(self, name, value):
+        self.changes += 1
+        self.values[name] = value
+        self.versions[name] = self.changes
+
+
+    # value of a set input or of a stage, a stage is calculated (with the stages it needs) only when one of its
+    # inputs changed since its last calculation
+    def get(self, name):
+        if name not in self.stages:
+            if name not in self.values:
+                raise KeyError('%s is not set' % name)
+            return self.values[name]
+
+        inputs, function, compare = self.stages[name]
+        values = [self.get(input_name) for input_name in inputs]
+        versions = tuple(self.versions[input_name] for input_name in inputs)
+        if self.input_versions.get(name) != versions:
+            previous = self.values.pop(name, None)
+            if not compare:
+                # the last value can hold memory the new one needs
+                previous = None
+
+            value = function(*values)
+            self.runs[name] += 1
+            self.input_versions[name] = versions
+            if compare and name in self.versions and same(previous, value):
+                self.values[name] = previous
+            else:
+                self.change(name, value)
+
+        return self.values[name]
+
+
+    # drop every value and stage result, the stages are kept
+    def clear(self):
+        self.values.clear()
+        self.versions.clear()
+        self.input_versions.clear()
+
+
+# equal values, arrays are compared by their content, dicts, lists and tuples value by value
+def same(a, b):
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return isinstance(a, np.ndarray) and isinstance(b, np.ndarray) and a.shape == b.shape and a.dtype == b.dtype and np.array_equal(a, b)
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(same(a[name], b[name]) for name in a)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return type(a) == type(b) and len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+
+    return a is b or bool(a == b)
+
+
+# best embedding position (like JobPool.search_position) when position is None, the given position otherwise
+def search_position(position, dcts, masks, mark, key, multipliers, tvalue, workers):
+    if position is not None:
+        return position
+
+    channels, channel_dcts, maximums = dcts
+    with JobPool(channels, channel_dcts, masks, mark[0], mark[1], key, multipliers, maximums, workers) as pool:
+        return pool.search_position(tvalue)[0]
+
+
+# candidates of every channel and mask (see engine.find_candidates)
+def evaluate_candidates(dcts, masks, mark, key, multipliers, workers, t_values):
+    channels, channel_dcts, maximums = dcts
+    # find_candidates writes the chosen T values in t_s, the t values of the stage are kept for the next runs
+    t_s = {channel_name: {_id: list(t) for _id, t in values.items()} for channel_name, values in t_values.items()}
+    with JobPool(channels, channel_dcts, masks, mark[0], mark[1], key, multipliers, maximums, workers) as pool:
+        return engine.find_candidates(pool, t_s)
+
+
+# stages of engine.watermark_image, the inputs to set are image, watermark, key, position (None to search it), tvalue,
+# multipliers, masks (see engine.define_masks), workers, cache, dtype and workspace (see engine.calculate_dcts)
+# stages give what engine gives: dcts (channels, dcts, maximums), mark (embedding and compare watermarks), embedding_position,
+# t_values, candidates, chosen, images (watermarked image, recovered image, extracted watermark, failed blocks) and code
+def watermark_pipeline():
+    pipeline = Pipeline()
+    pipeline.stage('dcts', ('image', 'masks', 'cache', 'dtype', 'workspace'),
+                   lambda image, masks, cache, dtype, workspace: engine.calculate_dcts(image, masks, cache=cache, dtype=dtype, workspace=workspace))
+    # one watermark value per block of the image
+    pipeline.stage('mark', ('watermark', 'image', 'key'),
+                   lambda watermark, image, key: engine.prepare_watermark(watermark, (-(-image.shape[0] // 8), -(-image.shape[1] // 8)), key))
+    pipeline.stage('embedding_position', ('position', 'dcts', 'masks', 'mark', 'key', 'multipliers', 'tvalue', 'workers'), search_position, compare=True)
+    pipeline.stage('t_values', ('dcts', 'masks', 'tvalue', 'embedding_position'),
+                   lambda dcts, masks, tvalue, position: engine.find_t_values(dcts[1], dcts[2], masks, tvalue, position))
+    pipeline.stage('candidates', ('dcts', 'masks', 'mark', 'key', 'multipliers', 'workers', 't_values'), evaluate_candidates)
+    pipeline.stage('chosen', ('candidates', 'masks'), engine.choose_candidate)
+    pipeline.stage('images', ('image', 'dcts', 'masks', 'chosen', 'mark', 'key', 'workspace'),
+                   lambda image, dcts, masks, chosen, mark, key, workspace:
+                   engine.materialize(image, dcts[1][chosen.channel][chosen.mask], masks[chosen.mask], chosen, mark[0], key, workspace))
+    pipeline.stage('code', ('images', 'chosen', 'key', 'masks'),
+                   lambda images, chosen, key, masks: engine.extraction_code(images[0], key, chosen.channel, chosen.mask, chosen.b, chosen.T, masks))
+
+    return pipeline
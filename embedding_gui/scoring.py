@@ -0,0 +1,88 @@
+import numpy as np
+
+
+# array versions of evaluate_psnr, evaluate_mask and evaluate_psnr_mark (new_utils)
+# they score a whole grid of candidates (positions, T values, masks, channels) at once with the same scores
+# the operations are done in the same order as the scalar functions, so the scores are exactly the same
+
+
+# default multipliers to evaluate our PSNR, used to give a sense of importance
+# for example extracted image psnr is more important than imperciptibility
+default_multipliers = {'imper': 1, 'recovered': 5, 'mask': 1, 'mark': 3}
+
+# psnr thresholds of evaluate_psnr and the bonus of every threshold
+psnr_thresholds = ((20, 1), (40, 2), (50, 3), (60, 4), (75, 5), (90, 6), (100, 7))
+
+
+# multipliers from a string like "imper=1,recovered=5,mask=1,mark=3", missing ones keep their default value
+# raises ValueError for unknown names or values that are not numbers
+def parse_multipliers(text, multipliers=default_multipliers):
+    multipliers = dict(multipliers)
+    for item in text.split(','):
+        name, _, value = item.partition('=')
+        name = name.strip()
+        if name not in multipliers:
+            raise ValueError('unknown multiplier ' + name)
+        value = float(value)
+        multipliers[name] = int(value) if value.is_integer() else value
+
+    return multipliers
+
+
+# scores of psnrs of watermarked or recovered images (see evaluate_psnr)
+def psnr_scores(psnrs, multiplier):
+    psnrs = np.asarray(psnrs, dtype=float)
+    # int(psnr_value - round(psnr_value / 10)), numpy also rounds halves to even
+    value = np.trunc(psnrs - np.round(psnrs / 10))
+
+    score = np.where(psnrs < 20, -(20 * multiplier), 0)
+    for threshold, bonus in psnr_thresholds:
+        score = np.where(psnrs >= threshold, score + ((bonus * multiplier) + (value * multiplier)), score)
+
+    return score
+
+
+# scores of masks (see evaluate_mask), masks are names ('mask15') or values (15)
+def mask_scores(masks, multiplier):
+    masks = np.asarray(masks)
+    if masks.dtype.kind in 'US':
+        masks = np.char.lstrip(masks.astype(str), 'mask').astype(int)
+
+    score = np.where(masks == 0, 3 * multiplier, 0)
+    score = np.where(masks > 1, score - (1 * multiplier), score)
+    score = np.where(masks >= 8, score - (2 * multiplier), score)
+    score = np.where(masks >= 16, score - (3 * multiplier), score)
+
+    return score
+
+
+# scores of psnrs of extracted watermarks (see evaluate_psnr_mark)
+def mark_scores(psnrs, multiplier):
+    psnrs = np.asarray(psnrs, dtype=float)
+
+    score = np.where(psnrs < 5, -(30 * multiplier), 0)
+    score = np.where(psnrs < 8, score - (15 * multiplier), score)
+    score = np.where(psnrs < 10, score - (10 * multiplier), score)
+
+    return score
+
+
+# scores of candidates, every argument is broadcast against the others so a whole grid is scored at once
+# with psnr_marks=None the watermark is not scored (like the score used to choose between channels and masks)
+def candidate_scores(psnrs_watermarked, psnrs_recovered, psnrs_mark, masks, multipliers=default_multipliers):
+    score = psnr_scores(psnrs_watermarked, multipliers['imper']) + psnr_scores(psnrs_recovered, multipliers['recovered'])\
+            + mask_scores(masks, multipliers['mask'])
+    if psnrs_mark is not None:
+        score = score + mark_scores(psnrs_mark, multipliers['mark'])
+
+    return score
+
+
+# index of the best score along the last axis with the rule of best_psnr_different_t
+# the first best score is kept and the first candidate is used if no score is above 0
+def best_index(scores):
+    scores = np.asarray(scores)
+    index = np.argmax(scores, axis=-1)
+    best = np.take_along_axis(scores, np.expand_dims(index, -1), axis=-1)[..., 0]
+
+    return np.where(best > 0, index, 0)
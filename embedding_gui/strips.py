@@ -0,0 +1,185 @@
+import os
+import shutil
+
+import cv2
+import numpy as np
+import metrics
+import scoring
+from new_utils import find_value_t, forwardProcess, maximum_dct_values, psnr_from_sse
+from new_algorithms import get_t_values, t_value_errors, errors_psnrs, embedded_images, verify_blocks, channel_mask_jobs
+import engine
+
+
+# watermarking of images too big for the memory, the image is read, transformed, embedded and written in bands
+# of whole blocks (8 * k rows), only one band and the watermark (one value per block) are in memory at once
+# the results are exactly the ones of engine.watermark_image:
+# - maximums of the dcts (and so b and T) are the maximums of the bands, found by a first pass
+# - errors of every T value (see t_value_errors) are sums over blocks, so the errors of the bands add up
+# - the key of the code (see engine.lsb_key) is a sum over rows, so the keys of the bands add up
+# images are .npy files or binary .ppm files (memory mapped, channels in the order of cv2) or any array
+
+# rows of a band
+band_rows = 512
+
+
+# a (height, width, 3) image in the order of cv2 mapped from an .npy file or a binary (P6) .ppm file
+def open_image(path, mode='r'):
+    if path.lower().endswith('.npy'):
+        image = np.load(path, mmap_mode=mode)
+    elif path.lower().endswith('.ppm'):
+        width, height, offset = read_ppm_header(path)
+        # ppm pixels are rgb, the reversed view is bgr like cv2.imread
+        image = np.memmap(path, dtype=np.uint8, mode=mode, offset=offset, shape=(height, width, 3))[:, :, ::-1]
+    else:
+        raise ValueError('only .npy and .ppm images can be read in bands: ' + path)
+
+    if image.ndim != 3 or image.shape[2] != 3 or image.dtype != np.uint8:
+        raise ValueError('%s is not a 8 bits rgb image' % path)
+
+    return image
+
+
+# width, height and offset of the pixels of a binary .ppm file
+def read_ppm_header(path):
+    with open(path, 'rb') as f:
+        header = f.read(1024)
+
+    fields, position = [], 0
+    while len(fields) < 4:
+        while position < len(header) and header[position:position + 1].isspace():
+            position += 1
+        if header[position:position + 1] == b'#':
+            position = header.index(b'\n', position)
+            continue
+        start = position
+        while position < len(header) and not header[position:position + 1].isspace():
+            position += 1
+        if start == position:
+            raise ValueError('wrong ppm header: ' + path)
+        fields.append(header[start:position])
+
+    if fields[0] != b'P6' or int(fields[3]) != 255:
+        raise ValueError('only binary 8 bits ppm images are supported: ' + path)
+
+    # a single white space ends the header
+    return int(fields[1]), int(fields[2]), position + 1
+
+
+# a new (height, width, 3) image mapped to an .npy or .ppm file, written band by band
+def create_image(path, shape):
+    height, width = shape[:2]
+    if path.lower().endswith('.npy'):
+        return np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=(height, width, 3))
+
+    with open(path, 'wb') as f:
+        f.write(b'P6\n%d %d\n255\n' % (width, height))
+        f.truncate(f.tell() + height * width * 3)
+
+    return open_image(path, 'r+')
+
+
+# (first row, band) of every band of rows of an image, bands are read one at a time
+def bands(image, rows=band_rows):
+    if rows % 8:
+        raise ValueError('bands must be whole blocks, rows must be a multiple of 8')
+
+    for row in range(0, image.shape[0], rows):
+        yield row, np.ascontiguousarray(image[row:row + rows])
+
+
+# (job, channel, dct of the masked channel) of every job (channel, mask_name) in a band
+# dcts are calculated one at a time so only one is in memory, dtype is their type (see engine.watermark_image)
+def band_dcts(band, masks, jobs, dtype=np.float64):
+    channels = dict(zip(('r', 'g', 'b'), cv2.split(band)))
+    for channel_name, _id in jobs:
+        yield (channel_name, _id), channels[channel_name], forwardProcess(image=channels[channel_name] ^ masks[_id], patch_size=8, dtype=dtype)
+
+
+# watermark an image band by band like engine.watermark_image, the watermarked image is written in output
+# (an array of the same shape, like create_image gives)
+# the position must be given, searching it would transform the image again for every position
+# dtype is the type of the dcts (see engine.watermark_image)
+# returns the same dict as engine.watermark_image without the images
+def watermark_strips(image, output, watermark, key=7777, position=63, tvalue=2, multipliers=engine.multipliers, masks=engine.mask_set, rows=band_rows,
+                     dtype=np.float64):
+    if position is None:
+        raise ValueError('the embedding position must be given to watermark in bands')
+
+    masks = engine.define_masks(masks)
+    jobs = channel_mask_jobs(masks)
+    height, width = image.shape[:2]
+    blocks = (-(-height // 8), -(-width // 8))
+    embedding_watermark, compare_watermark = engine.prepare_watermark(watermark, blocks, key)
+    # one value per block, the smallest type is enough
+    embedding_watermark = embedding_watermark.astype(np.int8)
+
+    # first pass, maximums of the dcts
+    maximums = {}
+    for row, band in bands(image, rows):
+        for job, channel, dct in band_dcts(band, masks, jobs, dtype):
+            band_maximums = maximum_dct_values(dct, channel ^ masks[job[1]])
+            maximums[job] = np.fmax(maximums[job], band_maximums) if job in maximums else band_maximums
+    t_s = {job: find_value_t(None, tvalue, position, maximums[job]) for job in jobs}
+
+    # second pass, errors of every T value
+    errors = {job: 0 for job in jobs}
+    for row, band in bands(image, rows):
+        for (channel_name, _id), channel, dct in band_dcts(band, masks, jobs, dtype):
+            b, t = t_s[(channel_name, _id)]
+            mark = embedding_watermark[row // 8:row // 8 + dct.shape[0]]
+            errors[(channel_name, _id)] += np.array(t_value_errors(channel, dct, masks[_id], mark, get_t_values(t), b))
+
+    candidates = {}
+    for (channel_name, _id), (b, t) in t_s.items():
+        T = get_t_values(t)
+        psnrs = np.array(errors_psnrs(errors[(channel_name, _id)], height * width * 3, blocks[0] * blocks[1]))
+        chosen = scoring.best_index(scoring.candidate_scores(psnrs[:, 0], psnrs[:, 1], psnrs[:, 2], _id, multipliers))
+        psnr1, psnr2, psnr3 = psnrs[chosen].tolist()
+        score = scoring.candidate_scores(psnr1, psnr2, None, _id, multipliers).item()
+        candidates[(channel_name, _id)] = engine.Candidate(channel_name, _id, b, T[chosen], psnr1, psnr2, psnr3, score)
+    chosen = engine.choose_candidate(candidates, masks)
+
+    # third pass, embed the chosen candidate, write it and verify it
+    another_code, failed_blocks, mark_sse = 0, 0, 0
+    for row, band in bands(image, rows):
+        channels = dict(zip(('r', 'g', 'b'), cv2.split(band)))
+        channel, mask = channels[chosen.channel], masks[chosen.mask]
+        dct = forwardProcess(image=channel ^ mask, patch_size=8, dtype=dtype)
+        mark = embedding_watermark[row // 8:row // 8 + dct.shape[0]]
+
+        _, channels[chosen.channel] = next(embedded_images(channel, dct, mark, 8, chosen.T, chosen.b, [chosen.T]))
+        _, extracted, failed = verify_blocks(channel, mask, channels[chosen.channel], mark, chosen.T, chosen.b, key, row=row // 8)
+        watermarked = cv2.merge([channels[c] for c in ('r', 'g', 'b')])
+        output[row:row + rows] = watermarked
+
+        another_code += int(engine.lsb_key(watermarked))
+        failed_blocks += int(failed.sum())
+        mark_sse += int(metrics.stack_sse([extracted], compare_watermark[row // 8:row // 8 + dct.shape[0]])[0])
+
+    if hasattr(output, 'flush'):
+        output.flush()
+
+    return {'code': engine.format_code(height, width, key, another_code, chosen.channel, chosen.mask, chosen.b, chosen.T, masks),
+            'channel': chosen.channel, 'mask': chosen.mask, 'position': position, 'psnr_watermarked': chosen.psnr_watermarked,
+            'psnr_recovered': chosen.psnr_recovered, 'psnr_watermark': psnr_from_sse(mark_sse, blocks[0] * blocks[1]),
+            'reversible': failed_blocks == 0, 'failed_blocks': failed_blocks}
+
+
+# watermark an image file band by band and save it in a folder (image.npy for .npy images, image.ppm for
+# the others, and code.txt), the folder is replaced, returns the result of watermark_strips
+def watermark_file(path, folder, watermark, key=7777, position=63, multipliers=engine.multipliers, masks=engine.mask_set, rows=band_rows, dtype=np.float64):
+    image = open_image(path) if path.lower().endswith(('.npy', '.ppm')) else cv2.imread(path)
+    if image is None:
+        raise ValueError('can not read image ' + path)
+
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+    os.mkdir(folder)
+
+    output = create_image(os.path.join(folder, 'image.npy' if path.lower().endswith('.npy') else 'image.ppm'), image.shape)
+    result = watermark_strips(image, output, watermark, key, position, multipliers=multipliers, masks=masks, rows=rows, dtype=dtype)
+
+    with open(os.path.join(folder, 'code.txt'), 'w+') as f:
+        f.write(result['code'])
+
+    return result
@@ -0,0 +1,203 @@
+import argparse
+import glob
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+import engine
+import scoring
+import strips
+from cache import DctCache
+from workspace import Workspace
+
+
+# watermark-embed: watermark images without the GUI
+# every image gets a folder in the output folder with image.png and code.txt, like "Save" in the GUI
+# with --band images are watermarked in bands of rows (see strips) and saved as image.ppm (image.npy for .npy images)
+# usage: python watermark_embed.py images_folder_or_glob... -o output [-w watermark.png] [-k 7777] [-p 63|auto] [-m imper=1,recovered=5,mask=1,mark=3] [--masks 0,15,16,31] [--band rows | --dct-store folder | --dct-cache folder] [--precision float64|float32] [--prefilter] [-j workers]
+
+
+# buffers of the images watermarked by this process, every process of a pool has its own (see workspace)
+workspace = Workspace()
+
+# dct caches of this process by folder, so the memory tier is kept from one image to the next
+caches = {}
+
+
+# dct cache of a folder, made the first time this process uses the folder
+def dct_cache(folder):
+    if folder not in caches:
+        caches[folder] = DctCache(folder=folder)
+    return caches[folder]
+
+
+# images from folders (every jpg/png inside, and ppm/npy with bands) and glob patterns
+def find_images(inputs, bands=False):
+    paths = []
+    for name in inputs:
+        if os.path.isdir(name):
+            for extension in ('*.png', '*.jpg') + (('*.ppm', '*.npy') if bands else ()):
+                paths += glob.glob(os.path.join(name, extension))
+        else:
+            paths += glob.glob(name)
+
+    return sorted(set(paths))
+
+
+# binary watermark like the set watermark window, a white image if no watermark is given
+def load_watermark(path=None):
+    if path is None:
+        return np.ones((512, 512), dtype=np.uint8) * 255
+
+    watermark = cv2.imread(path, 0)
+    if watermark is None:
+        raise ValueError('can not read watermark ' + path)
+
+    return cv2.threshold(watermark, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)[1]
+
+
+# folder name of every image in the output folder, the image name made unique (images of different folders can have
+# the same name, their folders would replace each other)
+def output_names(paths):
+    names, used = [], set()
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        unique_name, i = name, 1
+        while unique_name in used:
+            unique_name, i = '%s_%d' % (name, i), i + 1
+        used.add(unique_name)
+        names.append(unique_name)
+
+    return names
+
+
+# watermark one image and save it in output/name, returns the image path and its extracting code
+# with rows the image is watermarked in bands of that many rows, with store its dcts are memory mapped in store/name
+# (removed once the image is saved or failed, the store only holds the dcts of the images being watermarked)
+# and with cache they are taken from (or kept in) the disk cache of that folder (see cache), dtype is the type of the dcts
+# with prefilter the channels and masks that can not be chosen because of their clipped pixels are left out (see engine.find_candidates)
+def embed_file(path, name, output, watermark, key, position, multipliers=engine.multipliers, workers=1, masks=engine.mask_set, rows=None, store=None,
+               cache=None, dtype=np.float64, prefilter=False):
+    if rows:
+        result = strips.watermark_file(path, os.path.join(output, name), watermark, key, position, multipliers, masks, rows, dtype)
+        return path, result['code']
+
+    image = cv2.imread(path)
+    if image is None:
+        raise ValueError('can not read image ' + path)
+
+    if store is not None:
+        store = os.path.join(store, name)
+
+    if cache is not None:
+        cache = dct_cache(cache)
+
+    try:
+        result = engine.watermark_image(image, watermark, key, position, multipliers=multipliers, workers=workers, masks=masks, store=store, cache=cache,
+                                       dtype=dtype, workspace=workspace, prefilter=prefilter)
+        engine.save_watermarked(os.path.join(output, name), result['watermarked_image'], result['code'])
+    finally:
+        # files still mapped (on windows) can not be removed, they are left
+        if store is not None:
+            shutil.rmtree(store, ignore_errors=True)
+
+    return path, result['code']
+
+
+# run a job and catch its error, so one wrong image does not stop the others
+def run_job(job):
+    try:
+        return embed_file(*job) + ('ok',)
+    except Exception as error:
+        return job[0], '', 'error: %s' % error
+
+
+# watermark every image, with more images than workers every image is a job (one process per image)
+# otherwise images are done one after another and the workers evaluate their channels and masks
+# yields (path, code, status) in the order of the images as soon as they are done
+def embed_files(paths, output, watermark, key, position, multipliers, workers, masks=engine.mask_set, rows=None, store=None, cache=None, dtype=np.float64,
+                prefilter=False):
+    os.makedirs(output, exist_ok=True)
+    if workers > 1 and len(paths) >= workers:
+        with ProcessPoolExecutor(workers) as executor:
+            jobs = [executor.submit(run_job, (path, name, output, watermark, key, position, multipliers, 1, masks, rows, store, cache, dtype, prefilter))
+                    for path, name in zip(paths, output_names(paths))]
+            for job in jobs:
+                yield job.result()
+    else:
+        for path, name in zip(paths, output_names(paths)):
+            yield run_job((path, name, output, watermark, key, position, multipliers, workers, masks, rows, store, cache, dtype, prefilter))
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(prog='watermark-embed', description='watermark images, every image is saved in its own folder with its extracting code')
+    parser.add_argument('inputs', nargs='+', help='folders or glob patterns of the images')
+    parser.add_argument('-o', '--output', required=True, help='folder where watermarked images are saved')
+    parser.add_argument('-w', '--watermark', help='watermark image (default: white image)')
+    parser.add_argument('-k', '--key', type=int, default=7777, help='key used to scramble the watermark (default: 7777)')
+    parser.add_argument('-p', '--position', default='63', help='embedding position in zigzag order 1-63 or auto (default: 63)')
+    parser.add_argument('-m', '--multipliers', default='', help='weights of the scores, like imper=1,recovered=5,mask=1,mark=3 (default: those)')
+    parser.add_argument('--masks', default='0,15,16,31', help='xor values of the masks tested, 0 is needed and the extracting side must use the same ones (default: 0,15,16,31)')
+    parser.add_argument('--band', type=int, help='watermark in bands of this many rows (a multiple of 8) for images too big for the memory, ppm and npy images are read without loading them')
+    parser.add_argument('--dct-store', help='folder where the dcts of every image are memory mapped instead of kept in memory, removed once the image is saved')
+    parser.add_argument('--dct-cache', help='folder where the dcts are kept between runs, images already seen are not transformed again')
+    parser.add_argument('--precision', choices=('float64', 'float32'), default='float64', help='type of the dcts, float32 takes half the memory for the same results (default: float64)')
+    parser.add_argument('--prefilter', action='store_true', help='leave out the channels and masks whose clipped pixels already lose, worth it on images with saturated areas')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(), help='number of processes (default: every core)')
+    arguments = parser.parse_args(arguments)
+
+    if arguments.band is not None:
+        if arguments.band <= 0 or arguments.band % 8:
+            parser.error('band must be a positive multiple of 8')
+        if arguments.position == 'auto':
+            parser.error('position can not be auto with band')
+        if arguments.dct_store is not None or arguments.dct_cache is not None:
+            parser.error('dcts are not kept with band, dct-store and dct-cache can not be used')
+        if arguments.prefilter:
+            parser.error('prefilter can not be used with band')
+    if arguments.dct_store is not None and arguments.dct_cache is not None:
+        parser.error('dct-store and dct-cache can not be used together')
+
+    position = None
+    if arguments.position != 'auto':
+        position = int(arguments.position)
+        if not 1 <= position <= 63:
+            parser.error('position must be between 1 and 63 or auto')
+
+    multipliers = engine.multipliers
+    if arguments.multipliers:
+        try:
+            multipliers = scoring.parse_multipliers(arguments.multipliers)
+        except ValueError as error:
+            parser.error(str(error))
+
+    try:
+        masks = engine.parse_masks(arguments.masks)
+    except ValueError as error:
+        parser.error(str(error))
+
+    paths = find_images(arguments.inputs, arguments.band is not None)
+    if not paths:
+        parser.error('no images found')
+
+    watermark = load_watermark(arguments.watermark)
+
+    start = time.time()
+    failed = 0
+    for path, code, status in embed_files(paths, arguments.output, watermark, arguments.key, position, multipliers, max(arguments.workers, 1), masks, arguments.band,
+                                          arguments.dct_store, arguments.dct_cache, np.dtype(arguments.precision), arguments.prefilter):
+        if status == 'ok':
+            print(path, code)
+        else:
+            print(path, status, file=sys.stderr)
+            failed += 1
+    print('%d images in %.2f s, %d failed' % (len(paths), time.time() - start, failed), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
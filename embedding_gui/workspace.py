@@ -0,0 +1,40 @@
+import numpy as np
+
+
+# buffers kept between runs, so watermarking or extracting images of the same size again allocates almost nothing
+# a buffer is found by its name, asking for it with another shape or type replaces it by a new one
+# arrays written in a workspace (images given back included) are only valid until the next run with the same workspace,
+# what must be kept longer has to be copied
+class Workspace:
+
+    def __init__(self):
+        self.buffers = {}
+        # number and bytes of the buffers allocated, they stop growing once every buffer of a size exists
+        self.allocations = 0
+        self.allocated_bytes = 0
+
+
+    # buffer of a name with this shape and type, it holds whatever the last run wrote in it
+    def buffer(self, name, shape, dtype=np.float64):
+        shape, dtype = tuple(int(n) for n in shape), np.dtype(dtype)
+        array = self.buffers.get(name)
+        if array is None or array.shape != shape or array.dtype != dtype:
+            array = np.empty(shape, dtype=dtype)
+            self.buffers[name] = array
+            self.allocations += 1
+            self.allocated_bytes += array.nbytes
+
+        return array
+
+
+    # drop every buffer, the counters are kept
+    def clear(self):
+        self.buffers.clear()
+
+
+# buffer of a workspace, None without workspace so functions given it as out allocate a new array like before
+def workspace_buffer(workspace, name, shape, dtype=np.float64):
+    if workspace is None:
+        return None
+
+    return workspace.buffer(name, shape, dtype)
@@ -0,0 +1,126 @@
+import os
+import shutil
+from collections import namedtuple
+
+import cv2
+import numpy as np
+from new_algorithms import extract
+from workspace import workspace_buffer
+
+
+# extraction without any window, ApplicationWindow and the watermark-extract command use these functions
+# (channels are named 'r', 'g', 'b' in the order of cv2.split, like the GUI always did)
+
+channel_code = {0: 'r', 1: 'g', 2: 'b'}
+
+# xor values of the masks the embedding side tested, the mask digit of a code is an index in this set
+mask_set = (0, 15, 16, 31)
+
+
+# everything an extracting code gives, channel and mask are names ('r', 'mask0', ...)
+ExtractionCode = namedtuple('ExtractionCode', ['height', 'width', 'channel', 'mask', 'embed_block', 't', 'crypted_key', 'another_key'])
+
+
+# parse an extracting code, spaces are ignored
+# code is: length of height, height, length of width, width, channel, mask, embedding block (3 digits),
+# T (5 digits), length of crypted key (4 digits), crypted key, key taken from the watermarked image
+# masks is the set of mask values used when embedding
+# raises ValueError if the code is not valid
+def parse_code(code, masks=mask_set):
+    code = code.replace(' ', '')
+
+    if not code.isdigit():
+        raise ValueError('code must only contain digits')
+
+    off1 = int(code[0:1])
+    off2 = code[off1+1:off1+2]
+
+    if off2 == '':
+        raise ValueError('code is too short')
+
+    off2 = int(off2)
+
+    height = code[1:1+off1]
+    width = code[2+off1:2+off1+off2]
+    channel = code[2+off1+off2:3+off1+off2]
+    mask = code[3+off1+off2:4+off1+off2]
+    embed_block = code[4+off1+off2 :7+off1+off2]
+    t = code[7+off1+off2 : 12+off1+off2]
+    off3 = code[12+off1+off2 : 16+off1+off2]
+
+    if height == '' or width == '' or channel == '' or mask == '' or embed_block == '' or t == '' or off3 == '':
+        raise ValueError('code is too short')
+
+    channel, mask = int(channel), int(mask)
+    embed_block = int(embed_block)
+
+    if channel > 2 or mask >= len(masks) or embed_block > 63:
+        raise ValueError('wrong channel, mask or embedding block')
+
+    off3 = int(off3)
+
+    crypted_key = code[16+off1+off2 : 16+off1+off2+off3]
+    another_key = code[16+off1+off2+off3 : ]
+
+    if crypted_key == '' or another_key == '':
+        raise ValueError('code is too short')
+
+    return ExtractionCode(int(height), int(width), channel_code[channel], 'mask%d' % masks[mask], embed_block, float(t), int(crypted_key), int(another_key))
+
+
+# key taken from the LSBs of an image multiplied by its mirror
+def decipher_key(image, workspace=None):
+    decipher_key_from_image = np.bitwise_and(image, 1, out=workspace_buffer(workspace, 'lsb', image.shape, np.uint8))
+    mirrored = cv2.flip(decipher_key_from_image, 1, dst=workspace_buffer(workspace, 'mirrored lsb', image.shape, np.uint8))
+    np.multiply(decipher_key_from_image, mirrored, out=decipher_key_from_image)
+    return decipher_key_from_image.sum()
+
+
+# extract the watermark from an image and recover the original image with a parsed code
+# the key is deciphered with the image unless force is set, then the key of the code is used
+# with resized the image is resized to the size given by the code first
+# returns recovered image, extracted watermark and the key used
+# with a workspace (see workspace.Workspace) images of the same size are extracted again almost without allocating,
+# the recovered image is one of its buffers then and is only valid until its next use
+def extract_image(image, code, force=False, resized=False, workspace=None):
+    if resized:
+        image = cv2.resize(image, (code.width, code.height), cv2.INTER_CUBIC)
+
+    h, w = image.shape[:2]
+
+    another_key = code.another_key
+    if not force:
+        another_key = decipher_key(image, workspace)
+
+    key = code.crypted_key ^ another_key
+
+    if workspace is None:
+        r, g, b = cv2.split(image)
+    else:
+        r, g, b = (workspace.buffer('channel ' + name, (h, w), np.uint8) for name in ('r', 'g', 'b'))
+        cv2.split(image, [r, g, b])
+    channels = {'r':r, 'g':g, 'b':b}
+    extracting_channel = channels[code.channel].reshape(1, h, w)
+
+    recovered_channel, ex_mark = extract(embedded_img=extracting_channel, img_psize=8, t=code.t, b=code.embed_block, key=key, mode='extracting_mode',
+                                         workspace=workspace)
+
+    channels[code.channel] = recovered_channel.reshape(h, w)
+    # the mask is a single value xored in place with the whole image
+    recovered_image = cv2.merge((channels['r'], channels['g'], channels['b']), dst=workspace_buffer(workspace, 'recovered', image.shape, np.uint8))
+    np.bitwise_xor(recovered_image, np.uint8(int(code.mask[4:])), out=recovered_image)
+
+    return recovered_image, ex_mark.reshape(ex_mark.shape[1], ex_mark.shape[2]), key
+
+
+# save recovered image and extracted watermark in a folder (image.png and watermark.png), the folder is replaced
+def save_extracted(folder, recovered_image, extracted_watermark):
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+
+    # make folder
+    os.mkdir(folder)
+
+    # save recovered image and watermark
+    cv2.imwrite(os.path.join(folder, 'image.png'), recovered_image)
+    cv2.imwrite(os.path.join(folder, 'watermark.png'), extracted_watermark)
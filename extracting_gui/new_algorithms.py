@@ -1,53 +1,72 @@
-import numpy as np
-import new_utils
-
-# function will handle extract process
-def extract(embedded_img, img_psize=8, t=10, b=10, key=3994, mode='embedding_mode'):
-    c, h, w = embedded_img.shape
-    img_h, img_w = h, w
-    embedded_img = embedded_img.reshape(c, h*w)
-
-    # extract dct
-    embedded_img_dct = np.apply_along_axis(new_utils.forwardProcess, 1, embedded_img, shape=(h, w))
-
-    # Calculate auto mark size
-    mark_w = embedded_img_dct.shape[2]
-    mark_h = embedded_img_dct.shape[1]
-
-    c, h, w, d, _ = embedded_img_dct.shape
-    embedded_img_dct = embedded_img_dct.reshape(c, h*w, d*d)
-
-    # extracting
-    extracted_mark = embedded_img_dct[:, :, b]
-    extracted_mark = np.float32(np.where(extracted_mark < 0, -1, 1))
-
-    t = int(t)
-    # in embedding mode we need to get all possible T values
-    # to test best reversed image
-    T = np.arange(t, 10, -10)
-    # however in extracting mode we need 1 T value provided by extracting code by user
-    if mode == 'extracting_mode':
-        T = np.array([float(t)])    
-
-    # get the right shape to perform operation correctly
-    T = np.float32(np.repeat(T, len(extracted_mark[0])).reshape(T.shape[0], len(extracted_mark[0])))
-    extracted_mark *= T
-
-    # reverse to original state
-    embedded_img_dct[:, :, b] -= extracted_mark
-    
-    # reconstruct extracted watermark and extracted original image
-    extracted_mark /= T
-    extracted_mark[extracted_mark == -1] = 0
-    extracted_mark = extracted_mark.reshape(T.shape[0], mark_h * mark_w)
-    extracted_mark = extracted_mark.astype('uint8')
-    extracted_mark = np.apply_along_axis(new_utils.image_scramble, 1, extracted_mark, key=key, shape=(mark_h, mark_w))
-    extracted_mark = extracted_mark * 255
-    extracted_mark = extracted_mark.reshape(T.shape[0], mark_h, mark_w)
-    extracted_mark = extracted_mark.astype('uint8')
-
-    embedded_img_dct = embedded_img_dct.reshape(c, h*w*d*d)
-    extracted_original = np.apply_along_axis(new_utils.backwardProcess, 1, embedded_img_dct, shape=(h, w))
-    extracted_original = extracted_original[:, :img_h, :img_w]
-
-    return extracted_original.reshape(extracted_original.shape[0], extracted_original.shape[1]*extracted_original.shape[2]), extracted_mark.reshape(c, mark_h, mark_w)
\ No newline at end of file
+import numpy as np
+import new_utils
+from workspace import workspace_buffer
+
+
+# T values to test, from t down to 10 by steps of 10 unless some values are given
+def get_t_values(t, t_values=None):
+    if t_values is not None:
+        return np.asarray(t_values)
+    return np.arange(int(t), 10, -10)
+
+# function will handle extract process
+# the watermark is only in coefficient b, so we calculate that coefficient alone for every block
+# and recover the original image by removing T times the basis pattern of b from the pixels
+# gives the same results as the full dct and inverse dct of every image
+# in embedding mode t_values can be given when images were embedded with only some T values
+# with a workspace (see workspace.Workspace) the recovered images are one of its buffers
+def extract(embedded_img, img_psize=8, t=10, b=10, key=3994, mode='embedding_mode', t_values=None, workspace=None):
+    c, img_h, img_w = embedded_img.shape
+
+    t = int(t)
+    # in embedding mode we need to get all possible T values
+    # to test best reversed image (image i was embedded with T[i])
+    T = get_t_values(t, t_values)
+    # however in extracting mode we need 1 T value provided by extracting code by user
+    if mode == 'extracting_mode':
+        T = np.array([float(t)])
+    T = np.broadcast_to(T, (c,))
+
+    if workspace is None:
+        extracted_original = np.empty((c, img_h*img_w), dtype=np.uint8)
+    else:
+        extracted_original = workspace.buffer('originals', (c, img_h*img_w), np.uint8)
+    extracted_mark = None
+    for i, (_, _, original, mark) in enumerate(extracted_images(zip(T, embedded_img), img_psize, b, key, workspace=workspace)):
+        if extracted_mark is None:
+            extracted_mark = np.empty((c,) + mark.shape, dtype=np.uint8)
+        extracted_original[i], extracted_mark[i] = original.reshape(-1), mark
+
+    return extracted_original, extracted_mark
+
+
+# generator extracting images one at a time from (T, image) pairs, yields (T, image, original, watermark)
+# the same float image is used for every image to reverse them
+# row is the row of blocks where the images start when they are bands of a bigger image
+# with a workspace (see workspace.Workspace) every array is one of its buffers, the original image yielded included,
+# so it is overwritten by the next one
+def extracted_images(images, img_psize=8, b=10, key=3994, row=0, workspace=None):
+    candidate = None
+    for T, image in images:
+        # extracting
+        extracted_mark = new_utils.coefficient_signs(new_utils.coefficient_values(image, b, img_psize), new_utils.extract_patches(image, img_psize), b)
+
+        # reverse to original state
+        if candidate is None:
+            candidate = np.empty(image.shape) if workspace is None else workspace.buffer('candidate', image.shape)
+        bh, bw = extracted_mark.shape
+        pattern = new_utils.coefficient_pattern(extracted_mark, b, img_psize, workspace_buffer(workspace, 'pattern', (bh * img_psize, bw * img_psize)),
+                                                workspace_buffer(workspace, 'pattern blocks', (bh, bw, img_psize, img_psize)))[:image.shape[0], :image.shape[1]]
+        np.multiply(pattern, -T, out=candidate)
+        candidate += image
+        extracted_original = new_utils.round_pixels(candidate, workspace_buffer(workspace, 'extracted', image.shape, np.uint8))
+        # ties are rounded like the old process did, every block has them
+        if new_utils.tie_pixels(T, b, img_psize).any():
+            blocks = new_utils.fftpack_blocks(new_utils.extract_patches(image, img_psize), extracted_mark * -T, b)
+            extracted_original[...] = new_utils.fusion_patches(blocks)[:image.shape[0], :image.shape[1]]
+
+        # reconstruct extracted watermark
+        extracted_mark[extracted_mark == -1] = 0
+        extracted_mark = new_utils.image_scramble(extracted_mark.astype('uint8'), key, row=row) * 255
+
+        yield T, image, extracted_original, extracted_mark.astype('uint8')
@@ -0,0 +1,132 @@
+import os
+import shutil
+
+import cv2
+import numpy as np
+from new_algorithms import extracted_images
+import engine
+
+
+# extraction of images too big for the memory, the image is read, extracted and the recovered image written
+# in bands of whole blocks (8 * k rows), only one band and the watermark (one value per block) are in memory at once
+# the results are exactly the ones of engine.extract_image, the key taken from the image (see engine.decipher_key)
+# is a sum over rows, so the keys of the bands add up
+# images are .npy files or binary .ppm files (memory mapped, channels in the order of cv2) or any array
+
+# rows of a band
+band_rows = 512
+
+
+# a (height, width, 3) image in the order of cv2 mapped from an .npy file or a binary (P6) .ppm file
+def open_image(path, mode='r'):
+    if path.lower().endswith('.npy'):
+        image = np.load(path, mmap_mode=mode)
+    elif path.lower().endswith('.ppm'):
+        width, height, offset = read_ppm_header(path)
+        # ppm pixels are rgb, the reversed view is bgr like cv2.imread
+        image = np.memmap(path, dtype=np.uint8, mode=mode, offset=offset, shape=(height, width, 3))[:, :, ::-1]
+    else:
+        raise ValueError('only .npy and .ppm images can be read in bands: ' + path)
+
+    if image.ndim != 3 or image.shape[2] != 3 or image.dtype != np.uint8:
+        raise ValueError('%s is not a 8 bits rgb image' % path)
+
+    return image
+
+
+# width, height and offset of the pixels of a binary .ppm file
+def read_ppm_header(path):
+    with open(path, 'rb') as f:
+        header = f.read(1024)
+
+    fields, position = [], 0
+    while len(fields) < 4:
+        while position < len(header) and header[position:position + 1].isspace():
+            position += 1
+        if header[position:position + 1] == b'#':
+            position = header.index(b'\n', position)
+            continue
+        start = position
+        while position < len(header) and not header[position:position + 1].isspace():
+            position += 1
+        if start == position:
+            raise ValueError('wrong ppm header: ' + path)
+        fields.append(header[start:position])
+
+    if fields[0] != b'P6' or int(fields[3]) != 255:
+        raise ValueError('only binary 8 bits ppm images are supported: ' + path)
+
+    # a single white space ends the header
+    return int(fields[1]), int(fields[2]), position + 1
+
+
+# a new (height, width, 3) image mapped to an .npy or .ppm file, written band by band
+def create_image(path, shape):
+    height, width = shape[:2]
+    if path.lower().endswith('.npy'):
+        return np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=(height, width, 3))
+
+    with open(path, 'wb') as f:
+        f.write(b'P6\n%d %d\n255\n' % (width, height))
+        f.truncate(f.tell() + height * width * 3)
+
+    return open_image(path, 'r+')
+
+
+# (first row, band) of every band of rows of an image, bands are read one at a time
+def bands(image, rows=band_rows):
+    if rows % 8:
+        raise ValueError('bands must be whole blocks, rows must be a multiple of 8')
+
+    for row in range(0, image.shape[0], rows):
+        yield row, np.ascontiguousarray(image[row:row + rows])
+
+
+# extract the watermark from an image band by band like engine.extract_image, the recovered image is written
+# in output (an array of the same shape, like create_image gives)
+# images can not be resized in bands
+# returns extracted watermark and the key used
+def extract_strips(image, output, code, force=False, rows=band_rows):
+    height, width = image.shape[:2]
+
+    another_key = code.another_key
+    if not force:
+        another_key = sum(int(engine.decipher_key(band)) for _, band in bands(image, rows))
+
+    key = code.crypted_key ^ another_key
+    # the T value is read like extract does
+    T = float(int(code.t))
+    mask = np.uint8(int(code.mask[4:]))
+
+    watermark = np.empty((-(-height // 8), -(-width // 8)), dtype=np.uint8)
+    for row, band in bands(image, rows):
+        channels = dict(zip(('r', 'g', 'b'), cv2.split(band)))
+        _, _, channels[code.channel], mark = next(extracted_images([(T, channels[code.channel])], 8, code.embed_block, key, row // 8))
+        recovered = cv2.merge((channels['r'], channels['g'], channels['b']))
+        np.bitwise_xor(recovered, mask, out=recovered)
+        output[row:row + rows] = recovered
+        watermark[row // 8:row // 8 + mark.shape[0]] = mark
+
+    if hasattr(output, 'flush'):
+        output.flush()
+
+    return watermark, key
+
+
+# extract an image file band by band and save the recovered image and watermark in a folder (image.npy for
+# .npy images, image.ppm for the others, and watermark.png), the folder is replaced
+# returns the key used
+def extract_file(path, folder, code, force=False, rows=band_rows):
+    image = open_image(path) if path.lower().endswith(('.npy', '.ppm')) else cv2.imread(path)
+    if image is None:
+        raise ValueError('can not read image ' + path)
+
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+    os.mkdir(folder)
+
+    output = create_image(os.path.join(folder, 'image.npy' if path.lower().endswith('.npy') else 'image.ppm'), image.shape)
+    watermark, key = extract_strips(image, output, code, force, rows)
+    cv2.imwrite(os.path.join(folder, 'watermark.png'), watermark)
+
+    return key
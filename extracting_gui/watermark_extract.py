@@ -0,0 +1,153 @@
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import engine
+import strips
+from workspace import Workspace
+
+
+# watermark-extract: extract watermarks and recover images without the GUI
+# inputs are manifests (csv files with image,code lines, paths relative to the manifest) or folders
+# saved by watermark-embed / the embedding GUI (image.png and code.txt)
+# every image gets a folder in the output folder with image.png and watermark.png, like "Save" in the GUI
+# and a line in the report (output/report.csv) as soon as it is done
+# with --band images are extracted in bands of rows (see strips) and recovered images are saved as image.ppm
+# (image.npy for .npy images)
+# usage: python watermark_extract.py manifests_or_folders... -o output [-j workers] [--masks 0,15,16,31] [--force] [--resized | --band rows]
+
+
+# buffers of the images extracted by this process, every process of a pool has its own (see workspace)
+workspace = Workspace()
+
+
+# (image path, code) pairs of a manifest, an optional header line "image,code" and lines starting with # are skipped
+def read_manifest(path):
+    folder = os.path.dirname(os.path.abspath(path))
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith('#') or row[:2] == ['image', 'code']:
+                continue
+            if len(row) < 2:
+                raise ValueError('%s: line "%s" is not image,code' % (path, ','.join(row)))
+            yield os.path.join(folder, row[0].strip()), row[1]
+
+
+# (image path, code, name) of every input, every code is parsed once here so wrong codes are found before extracting
+# the name is the folder of image.png/code.txt pairs (image.ppm or image.npy when saved in bands) and the image name
+# for manifests (made unique)
+# returns the jobs and the errors of the codes that could not be parsed
+def read_inputs(inputs, masks=engine.mask_set):
+    jobs, errors, names = [], [], set()
+    for name in inputs:
+        if os.path.isdir(name):
+            image = os.path.join(name, 'image.png')
+            for extension in ('.ppm', '.npy'):
+                if not os.path.exists(image) and os.path.exists(os.path.join(name, 'image' + extension)):
+                    image = os.path.join(name, 'image' + extension)
+            with open(os.path.join(name, 'code.txt')) as f:
+                pairs = [(image, f.read(), os.path.basename(os.path.normpath(name)))]
+        else:
+            pairs = [(path, code, os.path.splitext(os.path.basename(path))[0]) for path, code in read_manifest(name)]
+
+        for path, code, output_name in pairs:
+            try:
+                code = engine.parse_code(code, masks)
+            except ValueError as error:
+                errors.append((path, str(error)))
+                continue
+
+            unique_name, i = output_name, 1
+            while unique_name in names:
+                unique_name, i = '%s_%d' % (output_name, i), i + 1
+            names.add(unique_name)
+            jobs.append((path, code, unique_name))
+
+    return jobs, errors
+
+
+# extract one image and save the recovered image and watermark in output/name
+# returns the image path and the key used, nothing big is sent back to the main process
+# with rows the image is extracted in bands of that many rows
+def extract_file(path, code, name, output, force=False, resized=False, rows=None):
+    if rows:
+        return path, int(strips.extract_file(path, os.path.join(output, name), code, force, rows))
+
+    image = cv2.imread(path)
+    if image is None:
+        raise ValueError('can not read image ' + path)
+
+    recovered_image, extracted_watermark, key = engine.extract_image(image, code, force, resized, workspace)
+    engine.save_extracted(os.path.join(output, name), recovered_image, extracted_watermark)
+
+    return path, int(key)
+
+
+# run a job and catch its error, so one wrong image does not stop the others
+def run_job(job):
+    try:
+        return extract_file(*job) + ('ok',)
+    except Exception as error:
+        return job[0], '', 'error: %s' % error
+
+
+# extract every job, with a pool of processes if workers > 1, results are given in the order of the jobs
+# as soon as they are done
+def extract_files(jobs, output, workers, force=False, resized=False, rows=None):
+    jobs = [(path, code, name, output, force, resized, rows) for path, code, name in jobs]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            yield from executor.map(run_job, jobs, chunksize=max(1, min(16, len(jobs) // (workers * 4))))
+    else:
+        yield from map(run_job, jobs)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(prog='watermark-extract', description='extract watermarks and recover images, every image is saved in its own folder')
+    parser.add_argument('inputs', nargs='+', help='manifests (csv with image,code lines) or folders with image.png and code.txt')
+    parser.add_argument('-o', '--output', required=True, help='folder where recovered images and watermarks are saved')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(), help='number of processes (default: every core)')
+    parser.add_argument('--masks', default='0,15,16,31', help='xor values of the masks used when embedding (default: 0,15,16,31)')
+    parser.add_argument('--force', action='store_true', help='use the key of the code instead of deciphering it from the image')
+    parser.add_argument('--resized', action='store_true', help='resize images to the size given by the code before extracting')
+    parser.add_argument('--band', type=int, help='extract in bands of this many rows (a multiple of 8) for images too big for the memory, ppm and npy images are read without loading them')
+    parser.add_argument('--report', help='csv file of the results (default: output/report.csv)')
+    arguments = parser.parse_args(arguments)
+
+    if arguments.band is not None:
+        if arguments.band <= 0 or arguments.band % 8:
+            parser.error('band must be a positive multiple of 8')
+        if arguments.resized:
+            parser.error('images can not be resized with band')
+
+    try:
+        masks = tuple(int(value) for value in arguments.masks.split(','))
+    except ValueError:
+        parser.error('masks must be numbers like 0,15,16,31')
+
+    jobs, errors = read_inputs(arguments.inputs, masks)
+    os.makedirs(arguments.output, exist_ok=True)
+
+    start = time.time()
+    failed = len(errors)
+    with open(arguments.report or os.path.join(arguments.output, 'report.csv'), 'w', newline='') as f:
+        report = csv.writer(f)
+        report.writerow(['image', 'key', 'status'])
+        for path, error in errors:
+            report.writerow([path, '', 'code error: %s' % error])
+
+        for path, key, status in extract_files(jobs, arguments.output, max(arguments.workers, 1), arguments.force, arguments.resized, arguments.band):
+            report.writerow([path, key, status])
+            f.flush()
+            failed += status != 'ok'
+
+    print('%d images in %.2f s, %d failed' % (len(jobs) + len(errors), time.time() - start, failed), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
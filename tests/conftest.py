@@ -0,0 +1,32 @@
+import os
+import sys
+
+import cv2
+import pytest
+
+
+# the embedding modules are flat modules imported by name, like when embedding_gui is run
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root, 'embedding_gui'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+images = os.path.join(root, 'test_images')
+
+
+# color test image, cropped to (203 x 317) at (top, left) so it needs padding and runs fast
+def read_crop(name, top=0, left=0, height=203, width=317):
+    image = cv2.imread(os.path.join(images, 'color', name))
+    assert image is not None, name
+    return image[top:top + height, left:left + width]
+
+
+# binary watermark from a gray test image (otsu threshold), like the GUI loads it
+def read_watermark(name):
+    gray = cv2.imread(os.path.join(images, 'gray', name), 0)
+    assert gray is not None, name
+    return cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)[1]
+
+
+@pytest.fixture
+def channel():
+    return read_crop('lena.png', 50, 0)[:, :, 2].copy()
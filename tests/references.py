@@ -0,0 +1,55 @@
+import cv2
+import numpy as np
+import scipy.fftpack as fft
+
+
+# the process before the matrix dct: blocks of the image padded with cv2.BORDER_REPLICATE,
+# two scipy.fftpack passes per block, signs read with < 0 and images rounded then clipped
+
+
+def fftpack_dct(blocks):
+    return fft.dct(fft.dct(blocks, type=2, norm='ortho', axis=-2), axis=-1, norm='ortho', type=2)
+
+
+def fftpack_idct(coefficients):
+    return fft.idct(fft.idct(coefficients, type=2, norm='ortho', axis=-2), axis=-1, norm='ortho', type=2)
+
+
+def forward(image, p=8):
+    h, w = image.shape
+    nh, nw = -(-h // p) * p, -(-w // p) * p
+    image = cv2.copyMakeBorder(image, 0, nh - h, 0, nw - w, cv2.BORDER_REPLICATE)
+    blocks = np.float64(image).reshape(nh // p, p, nw // p, p).swapaxes(1, 2)
+    return fftpack_dct(blocks)
+
+
+def backward(coefficients, shape):
+    bh, bw, p, _ = coefficients.shape
+    image = fftpack_idct(coefficients).swapaxes(1, 2).reshape(bh * p, bw * p)
+    return np.clip(np.round(image), 0, 255).astype(np.uint8)[:shape[0], :shape[1]]
+
+
+def scramble(image, key):
+    np_random = np.random.RandomState(key)
+    key_line = np.where(np_random.uniform(-1, 1, 16) >= 0, 1, 0)
+    key_line = np.tile(key_line, max(image.shape) // 16 + 1)
+
+    image = image ^ key_line[:image.shape[1]]
+    image = image.T ^ key_line[:image.shape[0]]
+    return image.T
+
+
+# watermarked channel of a T value, mark is the +1/-1 bit of every block
+def embed(channel, mark, T, b, p=8):
+    coefficients = forward(channel, p)
+    coefficients[..., b // p, b % p] += mark.reshape(coefficients.shape[:2]) * T
+    return backward(coefficients, channel.shape)
+
+
+# recovered channel and watermark image of a watermarked channel
+def extract(watermarked, T, b, key, p=8):
+    coefficients = forward(watermarked, p)
+    bits = np.where(coefficients[..., b // p, b % p] < 0, -1, 1)
+    coefficients[..., b // p, b % p] -= np.float32(bits) * np.float32(T)
+    mark = scramble((bits == 1).astype(np.uint8), key) * 255
+    return backward(coefficients, watermarked.shape), mark.astype(np.uint8)
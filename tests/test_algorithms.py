@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+import new_utils
+import references
+from new_algorithms import embedded_images, extracted_images, verify_blocks
+
+
+# +1/-1 bit of every block of the channel
+def random_mark(channel, seed=3):
+    shape = (-(-channel.shape[0] // 8), -(-channel.shape[1] // 8))
+    return np.where(np.random.RandomState(seed).randint(0, 2, shape) == 1, 1, -1).astype(np.float64)
+
+
+# T values with and without ties: b=0, 4, 32 and 36 round every pixel from a tie when T = 4 mod 8
+cases = [(10, [250, 100, 30]), (4, [20, 36]), (36, [28, 50]), (63, [60, 12])]
+
+
+@pytest.mark.parametrize('b, t_values', cases)
+def test_embedded_images_match_fftpack(channel, b, t_values):
+    mark = random_mark(channel)
+    images = embedded_images(channel, new_utils.forwardProcess(channel), mark, b=b, t_values=t_values)
+
+    for (T, image), expected_T in zip(images, t_values):
+        assert T == expected_T
+        assert np.array_equal(image, references.embed(channel, mark, T, b))
+
+
+@pytest.mark.parametrize('b, t_values', cases)
+def test_extracted_images_match_full_extraction(channel, b, t_values):
+    mark = random_mark(channel)
+    watermarked = [(T, references.embed(channel, mark, T, b)) for T in t_values]
+
+    for T, image, recovered, extracted_mark in extracted_images(watermarked, b=b, key=7777):
+        expected_recovered, expected_mark = references.extract(image, T, b, 7777)
+        assert np.array_equal(recovered, expected_recovered)
+        assert np.array_equal(extracted_mark, expected_mark)
+
+
+@pytest.mark.parametrize('b, T', [(10, 250), (10, 30), (4, 20), (63, 60)])
+def test_verify_blocks_matches_full_recovery(channel, b, T):
+    mask = np.uint8(15)
+    masked = channel ^ mask
+    mark = random_mark(channel)
+    watermarked = references.embed(masked, mark, T, b)
+    expected_recovered, expected_mark = references.extract(watermarked, T, b, 7777)
+    expected_recovered = expected_recovered ^ mask
+
+    recovered, extracted_mark, failed = verify_blocks(channel, mask, watermarked, mark, T, b, 7777)
+    assert np.array_equal(recovered, expected_recovered)
+    assert np.array_equal(extracted_mark, expected_mark)
+    differs = (references.forward(expected_recovered) != references.forward(channel)).any(axis=(2, 3))
+    assert np.array_equal(failed, differs)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import new_utils
+import references
+
+
+def test_dct_matches_fftpack():
+    blocks = np.random.RandomState(0).randint(0, 256, (6, 9, 8, 8)).astype(np.float64)
+    coefficients = new_utils.dct(blocks.copy())
+
+    assert np.allclose(coefficients, references.fftpack_dct(blocks), atol=1e-9)
+    assert np.allclose(new_utils.idct(coefficients), blocks, atol=1e-9)
+
+
+def test_forward_process_pads_like_replicate(channel):
+    assert np.allclose(new_utils.forwardProcess(channel), references.forward(channel), atol=1e-9)
+
+
+def test_backward_process_matches_fftpack(channel):
+    coefficients = references.forward(channel)
+    coefficients[..., 1, 2] += 30
+    expected = references.backward(coefficients.copy(), channel.shape)
+
+    image = new_utils.backwardProcess(coefficients)[:channel.shape[0], :channel.shape[1]]
+    assert np.array_equal(image, expected)
+
+
+def test_float32_maximums_match_float64(channel):
+    dct64 = new_utils.forwardProcess(channel)
+    dct32 = new_utils.forwardProcess(channel, dtype=np.float32)
+
+    assert dct32.dtype == np.float32
+    assert np.allclose(dct32, dct64, atol=new_utils.float32_tolerance)
+    expected = np.round(np.abs(references.forward(channel)).reshape(-1, 64).max(axis=0))
+    assert np.array_equal(new_utils.maximum_dct_values(dct64, channel), expected)
+    assert np.array_equal(new_utils.maximum_dct_values(dct32, channel), expected)
+
+
+@pytest.mark.parametrize('shape', [(203, 317), (16, 16), (5, 40)])
+@pytest.mark.parametrize('key', [7777, 3994, 0])
+def test_scramble_matches_random_state(shape, key):
+    image = np.random.RandomState(1).randint(0, 2, shape).astype(np.uint8)
+    scrambled = new_utils.image_scramble(image, key)
+
+    assert np.array_equal(scrambled, references.scramble(image, key))
+    assert np.array_equal(new_utils.image_scramble(scrambled, key), image)
+    # the global generator is left alone
+    state = np.random.get_state()[1].copy()
+    new_utils.image_scramble(image, key + 1)
+    assert np.array_equal(np.random.get_state()[1], state)
+
+
+def test_scramble_of_bands_matches_whole_image():
+    image = np.random.RandomState(2).randint(0, 2, (40, 30)).astype(np.uint8)
+    bands = [new_utils.image_scramble(image[row:row + 12], 7777, row=row) for row in range(0, 40, 12)]
+
+    assert np.array_equal(np.concatenate(bands), references.scramble(image, 7777))
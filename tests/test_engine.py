@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+import engine
+from conftest import read_crop, read_watermark, root
+from workspace import Workspace
+
+
+# codes the process before the matrix dct gave for these crops (see baseline_cases in benchmark.py),
+# the code holds the channel, mask, position, T and the LSB key of the watermarked image
+baseline_cases = [('lena.png', (50, 0), 'cat_gray.png', 10, '32033317000320005400055644149688'),
+                  ('hall1.png', (37, 51), 'cat_gray.png', 14, '32033317000040014200054376146224'),
+                  ('marchet.png', (37, 51), 'lena_gray.png', 39, '32033317000360011000054107748660')]
+
+
+def watermark_case(case, **options):
+    name, (top, left), watermark, position, _ = case
+    return engine.watermark_image(read_crop(name, top, left), read_watermark(watermark), position=position, workers=1, **options)
+
+
+@pytest.mark.parametrize('case', baseline_cases, ids=[case[0] for case in baseline_cases])
+def test_code_matches_baseline(case):
+    assert watermark_case(case)['code'] == case[-1]
+
+
+@pytest.mark.parametrize('case', baseline_cases, ids=[case[0] for case in baseline_cases])
+def test_float32_matches_float64(case):
+    result64 = watermark_case(case)
+    result32 = watermark_case(case, dtype=np.float32)
+
+    assert result32['code'] == result64['code']
+    for name in ('watermarked_image', 'recovered_image', 'display_watermark'):
+        assert np.array_equal(result32[name], result64[name])
+
+
+def test_workspace_reuse():
+    workspace = Workspace()
+    for case in baseline_cases + baseline_cases:
+        expected = watermark_case(case)
+        result = watermark_case(case, workspace=workspace)
+        assert result['code'] == expected['code']
+        for name in ('watermarked_image', 'recovered_image', 'display_watermark'):
+            assert np.array_equal(result[name], expected[name])
+
+    # the second pass over the same sizes allocates nothing
+    allocations = workspace.allocations
+    watermark_case(baseline_cases[0], workspace=workspace)
+    assert workspace.allocations == allocations
+
+
+# a reversible image comes back exactly, the other ones like the recovered image of the embedding
+@pytest.mark.parametrize('case', [('lena.png', (50, 0), 'lena_gray.png', 10, None), baseline_cases[2]], ids=['lena.png', 'marchet.png'])
+def test_round_trip(tmp_path, case):
+    image = read_crop(case[0], *case[1])
+    result = watermark_case(case)
+    assert result['reversible'] == (case[0] == 'lena.png')
+    assert np.array_equal(result['recovered_image'], image) == result['reversible']
+    engine.save_watermarked(str(tmp_path / 'image'), result['watermarked_image'], result['code'])
+
+    subprocess.run([sys.executable, 'watermark_extract.py', str(tmp_path / 'image'), '-o', str(tmp_path / 'output')],
+                   cwd=os.path.join(root, 'extracting_gui'), check=True, capture_output=True)
+
+    assert np.array_equal(cv2.imread(str(tmp_path / 'output' / 'image' / 'image.png')), result['recovered_image'])
+    assert np.array_equal(cv2.imread(str(tmp_path / 'output' / 'image' / 'watermark.png'), 0), result['display_watermark'])